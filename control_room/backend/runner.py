@@ -26,6 +26,7 @@ from .jobs import (
 )
 from .resolver import DOC_LOCK_GLOBAL
 from .settings import Settings
+from .storage import invalidate_for_action
 
 JOB_SCHEMA_VERSION = 1
 
@@ -480,6 +481,7 @@ class JobManager:
                 failure_reason=failure_reason,
                 failure_hint=failure_hint,
             )
+            invalidate_for_action(self.settings, job.action)
             if start_time:
                 duration_ms = int((ended_at - start_time).total_seconds() * 1000)
                 self.store.update_duration(job_id, duration_ms)
@@ -6,6 +6,16 @@ import os
 import sys
 from typing import Dict, Optional, Sequence
 
+try:  # missing dependencies are reported by _check_modules()
+    import httpx
+    import uvicorn
+
+    from .app import create_app
+except ImportError:  # pragma: no cover
+    httpx = None
+    uvicorn = None
+    create_app = None
+
 REQUIRED_MODULES = ("fastapi", "uvicorn", "pydantic", "httpx")
 DEFAULT_PATHS: Sequence[str] = ("/api/v1/health", "/api/v1/profiles", "/api/v1/docs")
 
@@ -30,10 +40,6 @@ async def _run_server(
     request_timeout: float,
     ready_timeout: float,
 ) -> None:
-    import uvicorn
-
-    from .app import create_app
-
     app = create_app()
     config = uvicorn.Config(
         app,
@@ -64,8 +70,6 @@ async def _wait_for_ready(
     timeout: float,
     request_timeout: float,
 ) -> bool:
-    import httpx
-
     async with httpx.AsyncClient(base_url=base_url, headers=headers, timeout=request_timeout) as client:
         end_time = asyncio.get_event_loop().time() + timeout
         while asyncio.get_event_loop().time() < end_time:
@@ -85,11 +89,9 @@ async def _exercise_endpoints(
     headers: Optional[Dict[str, str]],
     request_timeout: float,
 ) -> None:
-    import httpx
-
     async with httpx.AsyncClient(base_url=base_url, headers=headers, timeout=request_timeout) as session:
-        for path in DEFAULT_PATHS:
-            response = await session.get(path)
+        responses = await asyncio.gather(*(session.get(path) for path in DEFAULT_PATHS))
+        for path, response in zip(DEFAULT_PATHS, responses):
             response.raise_for_status()
             payload = response.json()
             if payload.get("error"):
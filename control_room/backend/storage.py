@@ -1,13 +1,32 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+from .jobs import JobAction
 from .settings import Settings
 
+_UTC = timezone.utc
 
-@dataclass
+SNAPSHOT_CACHE_TTL_S = 30.0
+JOB_SUBTREES: Dict[JobAction, Tuple[str, ...]] = {
+    JobAction.ASR_BATCH: ("01_input", "02_output_source", "04_archive"),
+    JobAction.LEXICON_BATCH: ("02_output_source",),
+    JobAction.LEXICON_SCAN: ("02_output_source",),
+    JobAction.LEXICON_APPLY: ("02_output_source",),
+    JobAction.RAG_BATCH: ("03_output_RAG",),
+    JobAction.RAG_EXPORT: ("03_output_RAG",),
+}
+
+DirSize = Tuple[int, int, Optional[float], Optional[float]]
+_dir_size_cache: Dict[Path, Tuple[float, DirSize]] = {}
+_dir_size_last_purge = 0.0
+
+
+@dataclass(slots=True)
 class StorageDir:
     label: str
     path: str
@@ -18,20 +37,23 @@ class StorageDir:
     newest: Optional[str]
 
 
-@dataclass
+@dataclass(slots=True)
 class HeavyDoc:
     doc_id: str
     size_bytes: int
     location: str
 
 
-def _dir_size(path: Path) -> Tuple[int, int, Optional[float], Optional[float]]:
+def _dir_size(path: Path) -> DirSize:
     total = 0
     count = 0
     oldest = None
     newest = None
     if not path.exists():
         return 0, 0, None, None
+    if path.is_file():
+        stat = path.stat()
+        return stat.st_size, 1, stat.st_mtime, stat.st_mtime
     for file_path in path.rglob("*"):
         if not file_path.is_file():
             continue
@@ -49,12 +71,45 @@ def _dir_size(path: Path) -> Tuple[int, int, Optional[float], Optional[float]]:
     return total, count, oldest, newest
 
 
+def _cached_dir_size(path: Path) -> DirSize:
+    now = time.monotonic()
+    cached = _dir_size_cache.get(path)
+    if cached is not None and now - cached[0] < SNAPSHOT_CACHE_TTL_S:
+        return cached[1]
+    result = _dir_size(path)
+    _purge_expired_sizes(now)
+    _dir_size_cache[path] = (now, result)
+    return result
+
+
+def _purge_expired_sizes(now: float) -> None:
+    """Drop expired entries (deleted or renamed doc folders) at most once per TTL."""
+    global _dir_size_last_purge
+    if now - _dir_size_last_purge < SNAPSHOT_CACHE_TTL_S:
+        return
+    _dir_size_last_purge = now
+    for path, (stamp, _) in list(_dir_size_cache.items()):
+        if now - stamp >= SNAPSHOT_CACHE_TTL_S:
+            del _dir_size_cache[path]
+
+
+def invalidate_subtree(settings: Settings, name: str) -> None:
+    """Drop cached sizes under ``data_pipeline_root / name`` (and its parents)."""
+    target = settings.data_pipeline_root / name
+    for path in list(_dir_size_cache):
+        if path == target or target in path.parents or path in target.parents:
+            _dir_size_cache.pop(path, None)
+
+
+def invalidate_for_action(settings: Settings, action: JobAction) -> None:
+    for name in JOB_SUBTREES.get(action, ()):
+        invalidate_subtree(settings, name)
+
+
 def _format_timestamp(ts: Optional[float]) -> Optional[str]:
     if ts is None:
         return None
-    from datetime import datetime, timezone
-
-    return datetime.fromtimestamp(ts, tz=timezone.utc).isoformat(timespec="seconds")
+    return datetime.fromtimestamp(ts, tz=_UTC).isoformat(timespec="seconds")
 
 
 def collect_storage_snapshot(settings: Settings, top_n: int = 5) -> Dict[str, object]:
@@ -68,7 +123,7 @@ def collect_storage_snapshot(settings: Settings, top_n: int = 5) -> Dict[str, ob
     ]
     for name, label in default_dirs:
         folder = root / name
-        size_bytes, items, oldest, newest = _dir_size(folder)
+        size_bytes, items, oldest, newest = _cached_dir_size(folder)
         dirs_summary.append(
             StorageDir(
                 label=label,
@@ -92,8 +147,8 @@ def collect_storage_snapshot(settings: Settings, top_n: int = 5) -> Dict[str, ob
 
     return {
         "root": str(root),
-        "directories": [entry.__dict__ for entry in dirs_summary],
-        "heavy_docs": [entry.__dict__ for entry in heavy_docs],
+        "directories": [asdict(entry) for entry in dirs_summary],
+        "heavy_docs": [asdict(entry) for entry in heavy_docs],
         "orphans": {"missing_rag": missing_rag, "missing_source": missing_source},
     }
 
@@ -105,7 +160,7 @@ def _list_dirs(base: Path) -> Dict[str, int]:
     for child in base.iterdir():
         if not child.is_dir():
             continue
-        size_bytes, _, _, _ = _dir_size(child)
+        size_bytes, _, _, _ = _cached_dir_size(child)
         docs[child.name] = size_bytes
     return docs
 
@@ -118,6 +173,6 @@ def _list_rag_dirs(base: Path) -> Dict[str, int]:
         if not child.is_dir() or not child.name.startswith("RAG-"):
             continue
         doc_id = child.name[4:]
-        size_bytes, _, _, _ = _dir_size(child)
+        size_bytes, _, _, _ = _cached_dir_size(child)
         docs[doc_id] = size_bytes
     return docs
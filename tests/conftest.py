@@ -1,11 +1,21 @@
 import sys
 from pathlib import Path
 
+import pytest
+
 ROOT = Path(__file__).resolve().parent.parent
 TRANSCRIBE_ROOT = ROOT / "transcribe-suite"
 SRC = TRANSCRIBE_ROOT / "src"
 
-for path in (ROOT, TRANSCRIBE_ROOT, SRC):
-    path_str = str(path)
-    if path_str not in sys.path:
-        sys.path.insert(0, path_str)
+_seen = set(sys.path)
+sys.path[:0] = [p for p in (str(SRC), str(TRANSCRIBE_ROOT), str(ROOT)) if p not in _seen]
+
+
+@pytest.fixture(scope="session")
+def backend_client():
+    from fastapi.testclient import TestClient
+
+    from control_room.backend import app as backend_app
+
+    with TestClient(backend_app.app) as client:
+        yield client
@@ -4,7 +4,6 @@ import time
 from pathlib import Path
 
 import pytest
-from fastapi.testclient import TestClient
 
 from control_room.backend import app as backend_app
 from control_room.backend import preview as preview_module
@@ -15,6 +14,7 @@ from control_room.backend.jobs import JobAction, JobCreate
 from control_room.backend.preview import preview_with_timeout
 from control_room.backend.resolver import ResolverError, resolve_doc
 from control_room.backend.runner import JobManager, JobStore
+from control_room.backend.storage import collect_storage_snapshot, invalidate_for_action
 
 
 class DummySettings:
@@ -166,6 +166,33 @@ def test_glossary_validation(tmp_path: Path) -> None:
     assert "doc" in target.read_text(encoding="utf-8")
 
 
+def test_storage_snapshot_invalidated_by_job_action(tmp_path: Path) -> None:
+    settings = make_settings(tmp_path)
+    rag_dir = settings.rag_output_dir / "RAG-DocA" / "v1"
+    rag_dir.mkdir(parents=True)
+    (rag_dir / "document.json").write_text("{}", encoding="utf-8")
+    collect_storage_snapshot(settings)
+    (rag_dir / "chunks.jsonl").write_text("{}\n" * 10, encoding="utf-8")
+    invalidate_for_action(settings, JobAction.RAG_EXPORT)
+    refreshed = collect_storage_snapshot(settings)
+    rag_entry = next(entry for entry in refreshed["directories"] if entry["label"] == "Exports RAG")
+    assert rag_entry["items"] == 2
+
+
+def test_storage_size_cache_purges_expired_entries(tmp_path: Path, monkeypatch) -> None:
+    from control_room.backend import storage
+
+    clock = [1000.0]
+    monkeypatch.setattr(storage.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(storage, "_dir_size_cache", {})
+    monkeypatch.setattr(storage, "_dir_size_last_purge", 0.0)
+    gone = tmp_path / "RAG-Gone"
+    storage._cached_dir_size(gone)
+    clock[0] += storage.SNAPSHOT_CACHE_TTL_S
+    storage._cached_dir_size(tmp_path)
+    assert list(storage._dir_size_cache) == [tmp_path]
+
+
 def test_failure_reason_mapping() -> None:
     reason, hint = classify_failure_from_log("pyannote_token missing", exit_code=1, canceled=False)
     assert reason == FailureReason.PYANNOTE_TOKEN_MISSING
@@ -176,10 +203,9 @@ def test_failure_reason_mapping() -> None:
     assert reason == FailureReason.CANCELED
 
 
-def test_api_version_in_docs(monkeypatch) -> None:
+def test_api_version_in_docs(monkeypatch, backend_client) -> None:
     monkeypatch.setattr(backend_app, "scan_documents", lambda *args, **kwargs: [])
-    client = TestClient(backend_app.app)
-    response = client.get("/api/v1/docs")
+    response = backend_client.get("/api/v1/docs")
     assert response.status_code == 200
     data = response.json()
     assert data["api_version"] == "v1"
@@ -205,9 +231,8 @@ def test_read_only_job_rejected_when_locked(tmp_path: Path) -> None:
         manager.create_job(read_job)
 
 
-def test_profiles_endpoint_contract() -> None:
-    client = TestClient(backend_app.app)
-    response = client.get("/api/v1/profiles")
+def test_profiles_endpoint_contract(backend_client) -> None:
+    response = backend_client.get("/api/v1/profiles")
     assert response.status_code == 200
     payload = response.json()
     assert payload["api_version"] == "v1"
@@ -215,14 +240,13 @@ def test_profiles_endpoint_contract() -> None:
     assert "profiles" in payload["data"]
 
 
-def test_jobs_endpoint_contract(monkeypatch) -> None:
+def test_jobs_endpoint_contract(monkeypatch, backend_client) -> None:
     class DummyManager:
         def list_jobs(self, limit: int = 100):
             return []
 
     monkeypatch.setattr(backend_app, "job_manager", DummyManager())
-    client = TestClient(backend_app.app)
-    response = client.get("/api/v1/jobs")
+    response = backend_client.get("/api/v1/jobs")
     assert response.status_code == 200
     payload = response.json()
     assert payload["api_version"] == "v1"
@@ -230,7 +254,7 @@ def test_jobs_endpoint_contract(monkeypatch) -> None:
     assert payload["data"] == {"jobs": []}
 
 
-def test_storage_endpoint_contract(monkeypatch) -> None:
+def test_storage_endpoint_contract(monkeypatch, backend_client) -> None:
     monkeypatch.setattr(
         backend_app,
         "collect_storage_snapshot",
@@ -241,8 +265,7 @@ def test_storage_endpoint_contract(monkeypatch) -> None:
             "orphans": {"missing_rag": [], "missing_source": []},
         },
     )
-    client = TestClient(backend_app.app)
-    response = client.get("/api/v1/storage")
+    response = backend_client.get("/api/v1/storage")
     assert response.status_code == 200
     payload = response.json()
     assert payload["api_version"] == "v1"
@@ -250,9 +273,8 @@ def test_storage_endpoint_contract(monkeypatch) -> None:
     assert payload["data"]["root"] == "/nas"
 
 
-def test_health_endpoint_contract() -> None:
-    client = TestClient(backend_app.app)
-    response = client.get("/api/v1/health")
+def test_health_endpoint_contract(backend_client) -> None:
+    response = backend_client.get("/api/v1/health")
     assert response.status_code == 200
     body = response.json()
     assert body["api_version"] == "v1"
@@ -288,26 +310,24 @@ def test_health_endpoint_contract() -> None:
         assert data["data_pipeline_root_hint"]
 
 
-def test_health_git_sha_fallback(monkeypatch) -> None:
+def test_health_git_sha_fallback(monkeypatch, backend_client) -> None:
     backend_app._git_sha.cache_clear()
 
     def _fail_git(*args, **kwargs):
         raise subprocess.CalledProcessError(returncode=1, cmd="git")
 
     monkeypatch.setattr(backend_app.subprocess, "run", _fail_git)
-    client = TestClient(backend_app.app)
-    response = client.get("/api/v1/health")
+    response = backend_client.get("/api/v1/health")
     assert response.status_code == 200
     data = response.json()["data"]
     assert data["git_sha"] == "unknown"
     backend_app._git_sha.cache_clear()
 
 
-def test_api_requires_key(monkeypatch) -> None:
+def test_api_requires_key(monkeypatch, backend_client) -> None:
     original = backend_app.settings.api_key
     backend_app.settings.api_key = "secret-token"
-    client = TestClient(backend_app.app)
-    response = client.get("/api/v1/docs")
+    response = backend_client.get("/api/v1/docs")
     assert response.status_code == 401
     payload = response.json()
     assert payload["error"]["code"] == "unauthorized"
@@ -8,6 +8,8 @@ import re
 import shutil
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict
 
@@ -18,6 +20,8 @@ SUPPORTED_PYTHON = {(3, 11), (3, 12)}
 SUPPORTED_LABEL = "3.11.x ou 3.12.x"
 FFMPEG_MIN_MAJOR = 6
 FFMPEG_MAX_MAJOR = 8
+FFMPEG_VERSION_RE = re.compile(r"\b(\d+)\.")
+DIST_NAME_SEPARATORS_RE = re.compile(r"[-_.]+")
 
 COMMON_PKGS: Dict[str, str] = {
     "faster-whisper": "1.2.1",
@@ -69,14 +73,31 @@ def ensure_python_version() -> str:
     return f"{version_info.major}.{version_info.minor}.{version_info.micro}"
 
 
-def pkg_version(package: str) -> str | None:
-    module_name = MODULE_ALIASES.get(package, package.replace("-", "_"))
+def _normalize_dist_name(name: str) -> str:
+    return DIST_NAME_SEPARATORS_RE.sub("-", name).lower()
+
+
+@lru_cache(maxsize=None)
+def installed_distributions() -> Dict[str, str]:
+    """Scan site-packages once and map normalized distribution names to versions."""
+    versions: Dict[str, str] = {}
     try:
         from importlib import metadata
 
-        return metadata.version(package)
+        for dist in metadata.distributions():
+            name = dist.metadata["Name"]
+            if name:
+                versions.setdefault(_normalize_dist_name(name), dist.version)
     except Exception:
         pass
+    return versions
+
+
+def pkg_version(package: str) -> str | None:
+    module_name = MODULE_ALIASES.get(package, package.replace("-", "_"))
+    installed = installed_distributions().get(_normalize_dist_name(package))
+    if installed:
+        return installed
 
     try:
         import importlib
@@ -108,7 +129,7 @@ def check_ff_bin(binary: str) -> str:
         fail(f"Echec {binary} -version ({exc})")
 
     first_line = result.stdout.splitlines()[0] if result.stdout else ""
-    match = re.search(r"\b(\d+)\.", first_line)
+    match = FFMPEG_VERSION_RE.search(first_line)
     if match:
         major = int(match.group(1))
         if not (FFMPEG_MIN_MAJOR <= major <= FFMPEG_MAX_MAJOR):
@@ -139,8 +160,11 @@ def main() -> None:
     ensure_requirements_lock()
     py_version = ensure_python_version()
     ensure_packages()
-    ffmpeg_version = check_ff_bin("ffmpeg")
-    ffprobe_version = check_ff_bin("ffprobe")
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        ffmpeg_future = executor.submit(check_ff_bin, "ffmpeg")
+        ffprobe_future = executor.submit(check_ff_bin, "ffprobe")
+        ffmpeg_version = ffmpeg_future.result()
+        ffprobe_version = ffprobe_future.result()
     print(">>> Checking Metal (optional, not required)...")
     check_mps()
     print(
@@ -1,7 +1,18 @@
 import inspect
+import json
+import logging
 import os
+import pickle
+import re
+import threading
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import nullcontext
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import accumulate
 from pathlib import Path
-from typing import Dict, List
+from typing import Any, Dict, List, Optional, Tuple
 
 from utils import (
     PipelineError,
@@ -10,7 +21,7 @@ from utils import (
     resolve_runtime_device,
     read_json,
     sanitize_whisper_text,
-    write_json,
+    write_json_fast,
 )
 
 try:
@@ -21,6 +32,117 @@ except ImportError as exc:  # pragma: no cover
 else:
     IMPORT_ERROR = None
 
+# Align models are shared by every Aligner of the process: (language, model_name, device) -> (model, metadata)
+_ALIGN_MODEL_CACHE: Dict[Tuple[str, str, str], Tuple[Any, Any]] = {}
+_ALIGN_MODEL_LOCK = threading.Lock()
+MAX_CUDA_SHARDS = 2
+# WhisperX aligns these languages per character (no spaces between words)
+UNSPACED_LANGUAGES = frozenset({"ja", "zh"})
+LOG_SAMPLE_EVERY = 50
+# set to skip the on-disk align signature cache (editable or patched whisperx installs)
+NO_SIGNATURE_CACHE_ENV_VAR = "TS_NO_ALIGN_SIGNATURE_CACHE"
+
+
+def _align_signature_cache_file(func) -> Optional[Path]:
+    if os.getenv(NO_SIGNATURE_CACHE_ENV_VAR):
+        return None
+    version = getattr(whisperx, "__version__", None)
+    if not version:
+        return None
+    cache_root = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "transcribe-suite"
+    name = f"{getattr(func, '__module__', '')}.{getattr(func, '__qualname__', '')}"
+    return cache_root / f"align_sig_{version}_{re.sub(r'[^A-Za-z0-9_.-]', '_', name)}.json"
+
+
+@lru_cache(maxsize=4)
+def _align_signature_params(func) -> frozenset:
+    """Parameter names of the align callable, persisted per whisperx version to skip cold-start introspection."""
+    cache_file = _align_signature_cache_file(func)
+    if cache_file is not None:
+        try:
+            return frozenset(json.loads(cache_file.read_text(encoding="utf-8")))
+        except (OSError, ValueError, TypeError):
+            pass
+    params = frozenset(inspect.signature(func).parameters)
+    if cache_file is not None:
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            cache_file.write_text(json.dumps(sorted(params)), encoding="utf-8")
+        except OSError:
+            pass
+    return params
+
+
+def _is_cuda_oom(exc: BaseException) -> bool:
+    # torch.cuda.OutOfMemoryError subclasses RuntimeError; older torch only says so in the message
+    return isinstance(exc, RuntimeError) and "out of memory" in str(exc).lower()
+
+
+def _empty_cuda_cache() -> None:
+    try:
+        import torch  # type: ignore
+    except ImportError:  # pragma: no cover
+        return
+    if torch.cuda.is_available():
+        torch.cuda.empty_cache()
+
+
+def save_aligned_payload(aligned_path: Path, payload: Dict) -> None:
+    """Write the canonical JSON plus a pickle sibling that is faster to load back."""
+    write_json_fast(aligned_path, payload)
+    try:
+        with aligned_path.with_suffix(".pkl").open("wb") as handle:
+            pickle.dump(payload, handle, protocol=5)
+    except OSError:
+        pass
+
+
+def load_aligned_payload(
+    aligned_path: Path, aligned_stat: Optional[os.stat_result] = None, logger: Optional[logging.Logger] = None
+) -> Dict:
+    """Prefer the pickle sibling when it is at least as recent as the JSON (JSON stays canonical)."""
+    pkl_path = aligned_path.with_suffix(".pkl")
+    try:
+        json_mtime = (aligned_stat or os.stat(aligned_path)).st_mtime
+        pkl_mtime = os.stat(pkl_path).st_mtime
+    except OSError:
+        return read_json(aligned_path)
+    if pkl_mtime >= json_mtime:
+        try:
+            with pkl_path.open("rb") as handle:
+                return pickle.load(handle)
+        except Exception as exc:
+            # truncated or stale pickles raise far more than UnpicklingError; the JSON is still good
+            (logger or logging.getLogger(__name__)).warning(
+                "Pickle d'alignement illisible (%s: %s), relecture du JSON %s", type(exc).__name__, exc, aligned_path
+            )
+    return read_json(aligned_path)
+
+
+@dataclass
+class DiarWindows:
+    starts: List[float]
+    ends: List[float]
+    speakers: List[Any]
+    reach: List[float]  # running max of ends, lets lookups stop early
+    order: List[int]  # position of each turn in the diarization list
+    fallback: Any
+    sole_speaker: Any = None  # set when every turn (and the fallback) is the same speaker
+
+    def speaker_at(self, ts: float) -> Any:
+        # overlapping turns: the one listed first wins, as with a linear scan of the diarization
+        idx = bisect_right(self.starts, ts) - 1
+        best = -1
+        while idx >= 0 and self.reach[idx] >= ts:
+            if self.ends[idx] >= ts and (best < 0 or self.order[idx] < self.order[best]):
+                best = idx
+            idx -= 1
+        return self.speakers[best] if best >= 0 else self.fallback
+
+    def covers(self, ts: float, margin: float = 0.0) -> bool:
+        idx = bisect_right(self.starts, ts + margin) - 1
+        return idx >= 0 and self.reach[idx] + margin >= ts
+
 
 class Aligner:
     def __init__(self, config: Dict, logger):
@@ -28,12 +150,16 @@ class Aligner:
         self.cfg = config.get("align", {})
         requested_device = self.cfg.get("device", config.get("asr", {}).get("device", "auto"))
         self.device = resolve_runtime_device(requested_device, logger=self.logger, label="Align")
-        self._cache = {}
         self.max_workers = max(1, int(self.cfg.get("workers", 4) or 4))
         self.batch_size = max(0, int(self.cfg.get("batch_size", 0) or 0))
         self.speech_only = bool(self.cfg.get("speech_only", False))
-        self._align_params_cache = None
+        self.mixed_precision = bool(self.cfg.get("mixed_precision", True))
+        self.pack_max_duration = max(0.0, float(self.cfg.get("pack_max_duration", 0.0) or 0.0))
+        # concurrent align calls on one CUDA model each hold their own activations: opt-in, capped
+        self.cuda_shards = min(MAX_CUDA_SHARDS, self.max_workers, max(1, int(self.cfg.get("cuda_shards", 1) or 1)))
         self._align_callable = None
+        self._align_pool: Optional[ThreadPoolExecutor] = None
+        self._diar_windows_cache: Optional[Tuple[List[Dict], DiarWindows]] = None
 
     def prewarm(self, language: str) -> None:
         lang = language or "en"
@@ -46,28 +172,69 @@ class Aligner:
         if whisperx is None:
             raise PipelineError(f"whisperx non disponible: {IMPORT_ERROR}")
         lang = language or "en"
-        if lang in self._cache:
-            return self._cache[lang]
-        self.logger.info("Chargement du modèle d'alignement WhisperX (%s)", lang)
         model_name = self.cfg.get("model_name")
-        align_model, metadata = whisperx.load_align_model(
-            language_code=lang,
-            device=self.device,
-            model_name=model_name,
-        )
-        self._cache[lang] = (align_model, metadata)
+        key = (lang, model_name or "", self.device)
+        cached = _ALIGN_MODEL_CACHE.get(key)
+        if cached is not None:
+            return cached
+        with _ALIGN_MODEL_LOCK:
+            cached = _ALIGN_MODEL_CACHE.get(key)
+            if cached is not None:
+                return cached
+            self.logger.info("Chargement du modèle d'alignement WhisperX (%s)", lang)
+            align_model, metadata = whisperx.load_align_model(
+                language_code=lang,
+                device=self.device,
+                model_name=model_name,
+            )
+            _ALIGN_MODEL_CACHE[key] = (align_model, metadata)
         return align_model, metadata
 
-    def _assign_speakers(self, segments: List[Dict], diar_segments: List[Dict]) -> None:
+    def _diar_windows(self, diar_segments: List[Dict]) -> Optional[DiarWindows]:
+        """Parse diarization turns once per result; shared by speech filter and speaker lookup."""
         if not diar_segments:
-            return
-
-        def find_speaker(ts: float) -> str:
-            for segment in diar_segments:
-                if segment["start"] <= ts <= segment["end"]:
-                    return segment["speaker"]
-            return diar_segments[-1]["speaker"]
+            return None
+        cached = self._diar_windows_cache
+        if cached is not None and cached[0] is diar_segments:
+            return cached[1]
+        parsed = []
+        for position, seg in enumerate(diar_segments):
+            try:
+                start = float(seg.get("start", 0.0))
+                end = float(seg.get("end", start))
+            except (TypeError, ValueError):
+                continue
+            if end <= start:
+                continue
+            parsed.append((start, end, seg.get("speaker"), position))
+        parsed.sort(key=lambda item: item[0])
+        ends = [end for _, end, _, _ in parsed]
+        windows = DiarWindows(
+            starts=[start for start, _, _, _ in parsed],
+            ends=ends,
+            speakers=[speaker for _, _, speaker, _ in parsed],
+            reach=list(accumulate(ends, max)),
+            order=[position for _, _, _, position in parsed],
+            fallback=diar_segments[-1].get("speaker"),
+        )
+        labels = set(windows.speakers)
+        labels.add(windows.fallback)
+        if len(labels) == 1:
+            windows.sole_speaker = windows.fallback
+        self._diar_windows_cache = (diar_segments, windows)
+        return windows
 
+    def _assign_speakers(self, segments: List[Dict], diar_segments: List[Dict]) -> None:
+        windows = self._diar_windows(diar_segments)
+        if windows is None:
+            return
+        if windows.sole_speaker is not None:
+            for seg in segments:
+                seg["speaker"] = windows.sole_speaker
+                for word in seg.get("words", []):
+                    word["speaker"] = windows.sole_speaker
+            return
+        find_speaker = windows.speaker_at
         for seg in segments:
             midpoint = (seg["start"] + seg["end"]) / 2
             speaker = find_speaker(midpoint)
@@ -76,6 +243,40 @@ class Aligner:
                 w_mid = (word["start"] + word["end"]) / 2
                 word["speaker"] = find_speaker(w_mid)
 
+    def _finalize_segments(self, segments: List[Dict], diar_segments: List[Dict]) -> None:
+        """Sanitize texts and assign speakers in a single pass over the aligned segments."""
+        windows = self._diar_windows(diar_segments)
+        find_speaker = windows.speaker_at if windows is not None else None
+        sole_speaker = windows.sole_speaker if windows is not None else None
+        debug = self.logger.isEnabledFor(logging.DEBUG)
+        # word tokens repeat heavily across a transcript: sanitize each distinct token once
+        clean_words: Dict[Any, str] = {}
+        for idx, segment in enumerate(segments):
+            if "text" in segment:
+                traced = debug and idx % LOG_SAMPLE_EVERY == 0
+                if traced:
+                    self.logger.debug("Avant sanitize align [%d]: %r", idx, segment["text"][:80])
+                segment["text"] = sanitize_whisper_text(segment["text"])
+                if traced:
+                    self.logger.debug("Apres sanitize align [%d]: %r", idx, segment["text"][:80])
+            if sole_speaker is not None:
+                segment["speaker"] = sole_speaker
+            elif find_speaker is not None:
+                segment["speaker"] = find_speaker((segment["start"] + segment["end"]) / 2)
+            for word in segment.get("words", []):
+                if "word" in word:
+                    raw = word["word"]
+                    cleaned = clean_words.get(raw) if isinstance(raw, str) else None
+                    if cleaned is None:
+                        cleaned = sanitize_whisper_text(raw)
+                        if isinstance(raw, str):
+                            clean_words[raw] = cleaned
+                    word["word"] = cleaned
+                if sole_speaker is not None:
+                    word["speaker"] = sole_speaker
+                elif find_speaker is not None:
+                    word["speaker"] = find_speaker((word["start"] + word["end"]) / 2)
+
     def run(
         self,
         audio_path: Path,
@@ -83,12 +284,17 @@ class Aligner:
         diarization_result: Dict,
         work_dir: Path,
         force: bool = False,
+        audio_array: Any = None,
     ) -> Dict:
         configure_torch_threads(self._thread_budget(), interop_threads=2)
         language = asr_result.get("language") or "en"
         aligned_path = work_dir / "03_aligned_whisperx.json"
-        if aligned_path.exists() and not force:
-            payload = read_json(aligned_path)
+        try:
+            aligned_stat = None if force else os.stat(aligned_path)
+        except FileNotFoundError:
+            aligned_stat = None
+        if aligned_stat is not None:
+            payload = load_aligned_payload(aligned_path, aligned_stat, self.logger)
             self.logger.info("Alignement WhisperX (cache) -> %s", aligned_path)
             return {
                 "segments": payload.get("segments", []),
@@ -97,12 +303,11 @@ class Aligner:
                 "align_status": payload.get("align_status", "cache"),
             }
 
-        align_model, metadata = self._load_align_model(language)
         diar_segments = diarization_result.get("segments", []) if diarization_result else []
         source_segments = asr_result.get("segments", [])
         segments_for_align = self._filter_speech_segments(source_segments, diar_segments)
         if segments_for_align:
-            self.logger.info("AVANT WhisperX align: %s", repr(segments_for_align[0].get("text", "")[:80]))
+            self.logger.info("AVANT WhisperX align: %r", segments_for_align[0].get("text", "")[:80])
 
         requested_kwargs = {"device": self.device}
         if self.max_workers:
@@ -115,19 +320,13 @@ class Aligner:
 
         align_error = None
         align_status = "ok"
-        try:
-            aligned = self._invoke_align(segments_for_align, align_model, metadata, audio_path, align_kwargs)
-        except Exception as exc:  # pragma: no cover
-            self.logger.warning(
-                "WhisperX align a echoue (%s). Fallback: segments non alignes mot-a-mot.",
-                exc,
+        if not segments_for_align:
+            self.logger.info("Aucun segment à aligner: modèle WhisperX non chargé")
+            aligned = {"segments": [], "language": language}
+        else:
+            aligned, align_status, align_error = self._align_or_fallback(
+                segments_for_align, language, audio_path, audio_array, align_kwargs
             )
-            aligned = {
-                "segments": segments_for_align,
-                "language": language,
-            }
-            align_status = "skipped"
-            align_error = f"{exc.__class__.__name__}: {str(exc)[:200]}"
 
         aligned["align_status"] = align_status
         if align_error:
@@ -140,21 +339,12 @@ class Aligner:
 
         aligned_segments = aligned.get("segments", [])
         if align_status == "ok" and aligned_segments:
-            self.logger.info("APRES WhisperX align: %s", repr(aligned_segments[0].get("text", "")[:80]))
-
-        for segment in aligned_segments:
-            if "text" in segment:
-                self.logger.info("Avant sanitize align: %s", repr(segment["text"][:80]))
-                segment["text"] = sanitize_whisper_text(segment["text"])
-                self.logger.info("Apres sanitize align: %s", repr(segment["text"][:80]))
-            for word in segment.get("words", []):
-                if "word" in word:
-                    word["word"] = sanitize_whisper_text(word["word"])
+            self.logger.info("APRES WhisperX align: %r", aligned_segments[0].get("text", "")[:80])
 
-        self._assign_speakers(aligned.get("segments", []), diar_segments)
+        self._finalize_segments(aligned_segments, diar_segments)
         aligned.setdefault("language", language)
         aligned_path.parent.mkdir(parents=True, exist_ok=True)
-        write_json(aligned_path, aligned)
+        save_aligned_payload(aligned_path, aligned)
 
         log_path = work_dir / "logs" / "align.log"
         log_path.parent.mkdir(parents=True, exist_ok=True)
@@ -176,6 +366,42 @@ class Aligner:
             result["align_filtered_kwargs"] = dropped_kwargs
         return result
 
+    def _align_or_fallback(self, segments, language, audio_path, audio_array, align_kwargs):
+        align_model, metadata = self._load_align_model(language)
+        try:
+            audio = audio_array if audio_array is not None else self._load_audio(audio_path)
+            aligned = self._invoke_align(segments, align_model, metadata, audio, align_kwargs)
+        except Exception as exc:  # pragma: no cover
+            self.logger.warning(
+                "WhisperX align a echoue (%s). Fallback: segments non alignes mot-a-mot.",
+                exc,
+            )
+            aligned = {
+                "segments": segments,
+                "language": language,
+            }
+            return aligned, "skipped", f"{exc.__class__.__name__}: {str(exc)[:200]}"
+        return aligned, "ok", None
+
+    def run_many(self, jobs: List[Tuple[Path, Dict, Dict, Path, bool]]) -> List[Dict]:
+        """Align several files in one process, loading each language model once.
+
+        Each job is ``(audio_path, asr_result, diarization_result, work_dir, force)``;
+        results come back in the input order.
+        """
+        configure_torch_threads(self._thread_budget(), interop_threads=2)
+        by_language: Dict[str, List[int]] = {}
+        for idx, (_, asr_result, _, _, _) in enumerate(jobs):
+            by_language.setdefault(asr_result.get("language") or "en", []).append(idx)
+        results: List[Optional[Dict]] = [None] * len(jobs)
+        for language, indices in by_language.items():
+            if any(jobs[idx][1].get("segments") for idx in indices):
+                self.prewarm(language)
+            for idx in indices:
+                audio_path, asr_result, diarization_result, work_dir, force = jobs[idx]
+                results[idx] = self.run(audio_path, asr_result, diarization_result, work_dir, force=force)
+        return results
+
     def _thread_budget(self) -> int:
         value = os.environ.get("POST_THREADS")
         try:
@@ -187,17 +413,8 @@ class Aligner:
     def _filter_speech_segments(self, segments: List[Dict], diar_segments: List[Dict]) -> List[Dict]:
         if not self.speech_only or not diar_segments:
             return segments
-        windows = []
-        for seg in diar_segments:
-            try:
-                start = float(seg.get("start", 0.0))
-                end = float(seg.get("end", start))
-            except (TypeError, ValueError):
-                continue
-            if end <= start:
-                continue
-            windows.append((start, end))
-        if not windows:
+        windows = self._diar_windows(diar_segments)
+        if windows is None or not windows.starts:
             return segments
         filtered: List[Dict] = []
         for seg in segments:
@@ -207,8 +424,7 @@ class Aligner:
             except (TypeError, ValueError):
                 filtered.append(seg)
                 continue
-            midpoint = (start + end) / 2
-            if any(win_start - 0.05 <= midpoint <= win_end + 0.05 for win_start, win_end in windows):
+            if windows.covers((start + end) / 2, margin=0.05):
                 filtered.append(seg)
         if not filtered:
             self.logger.warning("speech-only actif mais aucune fenêtre overlap ➜ fallback segments complets")
@@ -218,15 +434,166 @@ class Aligner:
             self.logger.info("speech-only: %d/%d segments ignorés avant align", drop_count, len(segments))
         return filtered
 
-    def _invoke_align(self, segments, align_model, metadata, audio_path, kwargs):
+    def _load_audio(self, audio_path: Path) -> Any:
+        """Decode the 16 kHz waveform once; the caller hands it to every align call of the file."""
+        key = str(audio_path)
+        if whisperx is None or not hasattr(whisperx, "load_audio"):
+            return key
+        return whisperx.load_audio(key)
+
+    def _invoke_align(self, segments, align_model, metadata, audio, kwargs):
         align_fn = self._get_align_callable()
-        return align_fn(
-            segments,
-            align_model,
-            metadata,
-            str(audio_path),
-            **kwargs,
-        )
+        language = metadata.get("language") if isinstance(metadata, dict) else None
+        if language in UNSPACED_LANGUAGES:
+            # WhisperX aligns these per character: windows could not be split back reliably
+            return self._align_windows(align_fn, segments, align_model, metadata, audio, kwargs)
+        packed = self._pack_segments_for_batch(segments)
+        aligned = self._align_windows(align_fn, packed, align_model, metadata, audio, kwargs)
+        if len(packed) == len(segments):
+            return aligned
+        unpacked = self._unpack_aligned_segments(aligned.get("segments", []), segments)
+        if unpacked is None:
+            self.logger.info("Align groupé: découpage temporel incohérent, réalignement segment par segment")
+            return self._align_windows(align_fn, segments, align_model, metadata, audio, kwargs)
+        aligned["segments"] = unpacked
+        return aligned
+
+    def _align_windows(self, align_fn, windows, align_model, metadata, audio, kwargs) -> Dict:
+        shards = self._align_shards(windows)
+        aligned = None
+        if len(shards) > 1:
+            aligned = self._align_sharded(align_fn, shards, align_model, metadata, audio, kwargs)
+        if aligned is None:
+            aligned = self._call_align(align_fn, windows, align_model, metadata, audio, kwargs)
+        return aligned
+
+    def _align_sharded(self, align_fn, shards, align_model, metadata, audio, kwargs) -> Optional[Dict]:
+        """Align shards concurrently; None when CUDA ran out of memory (caller goes serial)."""
+        pool = self._get_align_pool()
+        futures = [
+            pool.submit(self._call_align, align_fn, shard, align_model, metadata, audio, kwargs) for shard in shards
+        ]
+        # let every shard settle before a serial retry reuses the GPU
+        wait(futures)
+        errors = [future.exception() for future in futures if future.exception() is not None]
+        if errors:
+            if not all(_is_cuda_oom(exc) for exc in errors):
+                raise next(exc for exc in errors if not _is_cuda_oom(exc))
+            self.logger.warning(
+                "Align CUDA: mémoire insuffisante sur %d shards, alignement séquentiel", len(shards)
+            )
+            self.cuda_shards = 1
+            _empty_cuda_cache()
+            return None
+        parts = [future.result() for future in futures]
+        return {
+            "segments": [seg for part in parts for seg in part.get("segments", [])],
+            "word_segments": [word for part in parts for word in part.get("word_segments", [])],
+        }
+
+    def _call_align(self, align_fn, segments, align_model, metadata, audio, kwargs):
+        # autocast state is thread-local: enter it in the thread that runs the forward pass
+        with self._precision_context():
+            return align_fn(segments, align_model, metadata, audio, **kwargs)
+
+    def _precision_context(self):
+        if self.device != "cuda" or not self.mixed_precision:
+            return nullcontext()
+        try:
+            import torch  # type: ignore
+        except ImportError:  # pragma: no cover
+            return nullcontext()
+        dtype = torch.bfloat16 if torch.cuda.is_bf16_supported() else torch.float16
+        # log_softmax runs in fp32 under autocast, so the emissions fed to backtracking stay fp32
+        return torch.autocast("cuda", dtype=dtype)
+
+    def _align_shards(self, segments: List[Dict]) -> List[List[Dict]]:
+        """Split segments into contiguous shards so GPU forwards overlap with CPU backtracking."""
+        workers = min(self.cuda_shards, len(segments))
+        if self.device != "cuda" or workers < 2:
+            return [segments]
+        size = -(-len(segments) // workers)
+        return [segments[idx : idx + size] for idx in range(0, len(segments), size)]
+
+    def _get_align_pool(self) -> ThreadPoolExecutor:
+        if self._align_pool is None:
+            self._align_pool = ThreadPoolExecutor(max_workers=self.cuda_shards, thread_name_prefix="align")
+        return self._align_pool
+
+    def _pack_segments_for_batch(self, segments: List[Dict]) -> List[Dict]:
+        """Merge consecutive ASR segments into windows of at most ``pack_max_duration`` seconds."""
+        if self.pack_max_duration <= 0 or len(segments) < 2:
+            return segments
+        packed: List[Dict] = []
+        for seg in segments:
+            text = str(seg.get("text", "")).strip()
+            if packed and text and seg["end"] - packed[-1]["start"] <= self.pack_max_duration:
+                current = packed[-1]
+                current["end"] = seg["end"]
+                current["text"] = f"{current['text']} {text}".strip()
+                continue
+            packed.append({"start": seg["start"], "end": seg["end"], "text": text})
+        return packed
+
+    @staticmethod
+    def _unpack_aligned_segments(aligned_segments: List[Dict], originals: List[Dict]) -> Optional[List[Dict]]:
+        """Hand aligned sub-segments back to the original ASR segments by their time bounds.
+
+        A sub-segment lying inside one original is kept as WhisperX returned it; one that
+        straddles a boundary is split on its words' timestamps. Returns None when the
+        result cannot match an unpacked run (owners out of order, word counts off).
+        """
+        # cut points halfway between consecutive originals: bisect gives the owner of a timestamp
+        cuts = [(prev["end"] + nxt["start"]) / 2 for prev, nxt in zip(originals, originals[1:])]
+        pieces: List[List[Dict]] = [[] for _ in originals]
+        word_counts = [0] * len(originals)
+        last_owner = 0
+        for sub in aligned_segments:
+            words = sub.get("words") or []
+            owners: List[Optional[int]] = [
+                bisect_right(cuts, (word["start"] + word["end"]) / 2) if "start" in word and "end" in word else None
+                for word in words
+            ]
+            timed = [owner for owner in owners if owner is not None]
+            if not timed:
+                if "start" not in sub or "end" not in sub:
+                    return None
+                timed = [bisect_right(cuts, (sub["start"] + sub["end"]) / 2)]
+            # untimed words follow the previous timed word (leading ones the first timed word)
+            current = timed[0]
+            for pos, owner in enumerate(owners):
+                if owner is None:
+                    owners[pos] = current
+                else:
+                    current = owner
+            if timed[0] < last_owner or any(nxt < prev for prev, nxt in zip(timed, timed[1:])):
+                return None
+            last_owner = timed[-1]
+            if timed[0] == timed[-1]:
+                pieces[timed[0]].append(sub)
+                word_counts[timed[0]] += len(words)
+                continue
+            start = 0
+            for pos in range(1, len(words) + 1):
+                if pos < len(words) and owners[pos] == owners[start]:
+                    continue
+                owner = owners[start]
+                piece_words = words[start:pos]
+                bounds = [word for word in piece_words if "start" in word and "end" in word]
+                pieces[owner].append(
+                    {
+                        "start": bounds[0]["start"] if bounds else originals[owner]["start"],
+                        "end": bounds[-1]["end"] if bounds else originals[owner]["end"],
+                        "text": " ".join(str(word.get("word", "")).strip() for word in piece_words),
+                        "words": piece_words,
+                    }
+                )
+                word_counts[owner] += len(piece_words)
+                start = pos
+        for original, count in zip(originals, word_counts):
+            if count != len(str(original.get("text", "")).split()):
+                return None
+        return [piece for owned in pieces for piece in owned]
 
     def _filter_align_kwargs(self, kwargs: Dict):
         allowed = self._allowed_align_params()
@@ -241,21 +608,13 @@ class Aligner:
                 dropped.append(key)
         return filtered, dropped
 
-    def _allowed_align_params(self) -> set:
-        if self._align_params_cache is not None:
-            return self._align_params_cache
-        allowed = set()
+    def _allowed_align_params(self) -> frozenset:
         if whisperx is None:
-            self._align_params_cache = allowed
-            return allowed
+            return frozenset()
         try:
-            align_fn = self._get_align_callable()
-            sig = inspect.signature(align_fn)
-            allowed = set(sig.parameters.keys())
+            return _align_signature_params(self._get_align_callable())
         except Exception:
-            allowed = set()
-        self._align_params_cache = allowed
-        return allowed
+            return frozenset()
 
     def _get_align_callable(self):
         if self._align_callable is not None:
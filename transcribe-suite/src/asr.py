@@ -1,15 +1,27 @@
 import csv
 import json
+import logging
+import multiprocessing
 import os
+import threading
 import time
 from collections import Counter, deque
-from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures import BrokenExecutor, ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
+from queue import Empty, SimpleQueue
 from typing import Any, Dict, List, Optional, Tuple
 
-from utils import PipelineError, detect_language, read_json, resolve_runtime_device, sanitize_whisper_text, write_json
+from utils import (
+    PipelineError,
+    detect_language,
+    dumps_json_line,
+    read_json,
+    resolve_runtime_device,
+    sanitize_whisper_text,
+    write_json_fast,
+)
 
 try:
     from faster_whisper import WhisperModel
@@ -19,8 +31,13 @@ except ImportError as exc:  # pragma: no cover
 else:
     IMPORT_ERROR = None
 
+try:
+    from faster_whisper import BatchedInferencePipeline
+except ImportError:  # pragma: no cover - faster-whisper < 1.1
+    BatchedInferencePipeline = None
+
 
-@dataclass
+@dataclass(slots=True)
 class SegmentJob:
     index: int
     start_ms: int
@@ -31,7 +48,7 @@ class SegmentJob:
     retries: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class WorkerPlan:
     count: int
     source: str
@@ -39,34 +56,111 @@ class WorkerPlan:
     note: Optional[str] = None
     clamped_from: Optional[int] = None
     clamp_notes: List[str] = field(default_factory=list)
+    cpu_slices: List[List[int]] = field(default_factory=list)
 
 
 _WORKER_MODEL: Optional[WhisperModel] = None
+_WORKER_BATCHED: Any = None
 _WORKER_MODEL_OPTIONS: Dict[str, Any] = {}
 _WORKER_LOG_PATH: Optional[Path] = None
+_WORKER_LOGGER: Optional[logging.Logger] = None
+POOL_SEGMENT_HINT = 64  # pools are sized for a full run, not for the pending count
+_TRANSCRIBE_KWARGS = frozenset(
+    {
+        "beam_size",
+        "best_of",
+        "language",
+        "vad_filter",
+        "chunk_length",
+        "word_timestamps",
+        "condition_on_previous_text",
+        "no_speech_threshold",
+        "temperature",
+        "initial_prompt",
+    }
+)
+STATE_FLUSH_INTERVAL_S = 1.0
+
+
+def _listdir_names(directory: Path) -> set:
+    try:
+        with os.scandir(directory) as entries:
+            return {entry.name for entry in entries}
+    except OSError:
+        return set()
+
 
+def _count_language_vote(votes: Counter, result: Dict[str, Any]) -> None:
+    language = result.get("language")
+    if language not in (None, "", "auto"):
+        votes[language] += 1
 
-def _worker_bootstrap(env: Dict[str, str], log_dir: str, model_opts: Dict[str, Any]) -> None:
+
+def _is_primary_thread(cpu: int) -> bool:
+    """False for the SMT siblings of a core (Linux sysfs); True when topology is unknown."""
+    siblings_path = Path(f"/sys/devices/system/cpu/cpu{cpu}/topology/thread_siblings_list")
+    try:
+        first = siblings_path.read_text(encoding="ascii").strip().replace("-", ",").split(",")[0]
+        return int(first) == cpu
+    except (OSError, ValueError):
+        return True
+
+
+def _worker_bootstrap(
+    env: Dict[str, str],
+    log_dir: str,
+    model_opts: Dict[str, Any],
+    cpu_slices: Optional[List[List[int]]] = None,
+    slot_counter: Any = None,
+) -> None:
     for key, value in (env or {}).items():
         if value is None:
             continue
         os.environ[key] = str(value)
+    global _WORKER_MODEL_OPTIONS
+    _WORKER_MODEL_OPTIONS = dict(model_opts or {})
+    if cpu_slices and slot_counter is not None and hasattr(os, "sched_setaffinity"):
+        with slot_counter.get_lock():
+            slot = slot_counter.value
+            slot_counter.value += 1
+        cpus = cpu_slices[slot % len(cpu_slices)]
+        try:
+            os.sched_setaffinity(0, set(cpus))
+        except OSError:
+            pass
+        else:
+            # CTranslate2 sizes its intra-op pool at model load: it must fit the
+            # slice length, not the machine core count, or workers oversubscribe.
+            requested_threads = int(_WORKER_MODEL_OPTIONS.get("cpu_threads") or 0)
+            _WORKER_MODEL_OPTIONS["cpu_threads"] = min(requested_threads, len(cpus)) if requested_threads else len(cpus)
+    _bind_worker_log(log_dir)
+
+
+def _bind_worker_log(log_dir: Optional[str]) -> None:
+    """Point the worker logger at <log_dir>/asr_worker_<pid>.log (one open file per run)."""
+    global _WORKER_LOG_PATH, _WORKER_LOGGER
+    if not log_dir:
+        return
     log_dir_path = Path(log_dir)
+    if _WORKER_LOG_PATH is not None and _WORKER_LOG_PATH.parent == log_dir_path:
+        return
     log_dir_path.mkdir(parents=True, exist_ok=True)
-    global _WORKER_LOG_PATH, _WORKER_MODEL_OPTIONS
-    _WORKER_MODEL_OPTIONS = model_opts or {}
     _WORKER_LOG_PATH = log_dir_path / f"asr_worker_{os.getpid()}.log"
+    worker_logger = logging.getLogger(f"asr.worker.{os.getpid()}")
+    worker_logger.setLevel(logging.INFO)
+    worker_logger.propagate = False
+    for handler in list(worker_logger.handlers):
+        worker_logger.removeHandler(handler)
+        handler.close()
+    handler = logging.FileHandler(_WORKER_LOG_PATH, encoding="utf-8", delay=True)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    worker_logger.addHandler(handler)
+    _WORKER_LOGGER = worker_logger
 
 
 def _worker_log(message: str) -> None:
-    if _WORKER_LOG_PATH is None:
-        return
-    try:
-        _WORKER_LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
-        with _WORKER_LOG_PATH.open("a", encoding="utf-8") as handle:
-            handle.write(message.strip() + "\n")
-    except OSError:
-        pass
+    if _WORKER_LOGGER is not None:
+        _WORKER_LOGGER.info(message.strip())
 
 
 def _ensure_worker_model() -> WhisperModel:
@@ -79,49 +173,52 @@ def _ensure_worker_model() -> WhisperModel:
     requested_device = _WORKER_MODEL_OPTIONS.get("device", "auto")
     device = resolve_runtime_device(requested_device, logger=None, label="ASR worker")
     compute_type = _WORKER_MODEL_OPTIONS.get("compute_type", "auto")
-    _WORKER_MODEL = WhisperModel(model_name, device=device, compute_type=compute_type)
+    model_kwargs: Dict[str, Any] = {}
+    if _WORKER_MODEL_OPTIONS.get("cpu_threads"):
+        model_kwargs["cpu_threads"] = int(_WORKER_MODEL_OPTIONS["cpu_threads"])
+    _WORKER_MODEL = WhisperModel(model_name, device=device, compute_type=compute_type, **model_kwargs)
     return _WORKER_MODEL
 
 
-def _transcribe_segment(job: Dict[str, Any], decoder_cfg: Dict[str, Any]) -> Dict[str, Any]:
-    model = _ensure_worker_model()
+def _ensure_worker_batched():
+    global _WORKER_BATCHED
+    if _WORKER_BATCHED is None:
+        _WORKER_BATCHED = BatchedInferencePipeline(model=_ensure_worker_model())
+    return _WORKER_BATCHED
+
+
+def _transcribe_segment(
+    job: Dict[str, Any],
+    decoder_cfg: Dict[str, Any],
+    model: Optional[WhisperModel] = None,
+    batched: Any = None,
+    writes: Optional[SimpleQueue] = None,
+) -> Dict[str, Any]:
+    if model is None:
+        _bind_worker_log(job.get("log_dir"))
+        model = _ensure_worker_model()
     language_hint = job.get("language") or "auto"
-    forced_language = None if language_hint in ("auto", "", None) else language_hint
-    temperature = float(decoder_cfg.get("temperature", 0.0))
-    fallback = decoder_cfg.get("temperature_fallback")
-    if fallback:
-        temperature = (temperature, temperature + float(fallback))
-    raw_kwargs = dict(
-        beam_size=int(decoder_cfg.get("beam_size", 1)),
-        best_of=int(decoder_cfg.get("best_of", 1)),
-        language=forced_language,
-        vad_filter=bool(decoder_cfg.get("vad_filter", False)),
-        chunk_length=decoder_cfg.get("chunk_length"),
-        word_timestamps=bool(decoder_cfg.get("word_timestamps", False)),
-        condition_on_previous_text=bool(decoder_cfg.get("condition_on_previous_text", False)),
-        no_speech_threshold=float(decoder_cfg.get("no_speech_threshold", 0.6)),
-        temperature=temperature,
-        initial_prompt=job.get("initial_prompt") or decoder_cfg.get("initial_prompt"),
-    )
-    allowed_keys = {
-        "beam_size",
-        "best_of",
-        "language",
-        "vad_filter",
-        "chunk_length",
-        "word_timestamps",
-        "condition_on_previous_text",
-        "no_speech_threshold",
-        "temperature",
-        "initial_prompt",
-    }
-    kwargs = {key: value for key, value in raw_kwargs.items() if key in allowed_keys and value is not None}
-    segments_iter, info = model.transcribe(str(job["audio_path"]), **kwargs)
+    kwargs = dict(decoder_cfg["transcribe_kwargs"])
+    if language_hint not in ("auto", "", None):
+        kwargs["language"] = language_hint
+    initial_prompt = job.get("initial_prompt") or decoder_cfg.get("initial_prompt")
+    if initial_prompt is not None:
+        kwargs["initial_prompt"] = initial_prompt
+    batch_size = decoder_cfg.get("batch_size")
+    if batch_size and BatchedInferencePipeline is not None:
+        pipeline = batched if batched is not None else _ensure_worker_batched()
+        segments_iter, info = pipeline.transcribe(
+            str(job["audio_path"]), batch_size=int(batch_size), **kwargs
+        )
+    else:
+        segments_iter, info = model.transcribe(str(job["audio_path"]), **kwargs)
     offset_ms = int(job["start_ms"])
     chunks: List[Dict[str, Any]] = []
     texts: List[str] = []
-    logprobs: List[float] = []
-    no_speech_scores: List[float] = []
+    lp_sum = 0.0
+    lp_n = 0
+    ns_sum = 0.0
+    ns_n = 0
     for seg in segments_iter:
         text = sanitize_whisper_text(seg.text)
         if text:
@@ -130,41 +227,58 @@ def _transcribe_segment(job: Dict[str, Any], decoder_cfg: Dict[str, Any]) -> Dic
         end_ms = offset_ms + int(round(float(seg.end or 0.0) * 1000))
         avg_lp = getattr(seg, "avg_logprob", None)
         if avg_lp is not None:
-            logprobs.append(float(avg_lp))
+            avg_lp = float(avg_lp)
+            lp_sum += avg_lp
+            lp_n += 1
         ns_prob = getattr(seg, "no_speech_prob", None)
         if ns_prob is not None:
-            no_speech_scores.append(float(ns_prob))
-        chunks.append(
-            {
-                "t0": start_ms,
-                "t1": end_ms,
-                "text": text,
-                "avg_logprob": float(avg_lp) if avg_lp is not None else None,
-            }
-        )
-
-    payload = {
-        "segment_index": job["index"],
-        "start_ms": job["start_ms"],
-        "end_ms": job["end_ms"],
-        "language": info.language or language_hint,
-        "avg_logprob": (sum(logprobs) / len(logprobs)) if logprobs else None,
-        "no_speech_prob": (sum(no_speech_scores) / len(no_speech_scores)) if no_speech_scores else None,
-        "chunks": chunks,
-    }
+            ns_sum += float(ns_prob)
+            ns_n += 1
+        chunks.append({"t0": start_ms, "t1": end_ms, "text": text, "avg_logprob": avg_lp})
+
+    language = info.language or language_hint
+    if texts:
+        payload = {
+            "segment_index": job["index"],
+            "start_ms": job["start_ms"],
+            "end_ms": job["end_ms"],
+            "language": language,
+            "avg_logprob": lp_sum / lp_n if lp_n else None,
+            "no_speech_prob": ns_sum / ns_n if ns_n else None,
+            "chunks": chunks,
+        }
+    else:
+        # silence / music: a one-line sentinel is enough for the merger and for resume
+        payload = {"segment_index": job["index"], "empty": True}
 
     output_path = Path(job["output_path"])
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    with output_path.open("w", encoding="utf-8") as handle:
-        handle.write(json.dumps(payload, ensure_ascii=False) + "\n")
+    data = dumps_json_line(payload)
+    if writes is not None:
+        writes.put((output_path, data))
+    else:
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_bytes(data)
     _worker_log(f"Segment {job['index']:05d} ➜ {output_path.name} ({len(chunks)} chunks)")
     return {
         "segment_index": job["index"],
-        "language": payload["language"],
+        "language": language,
         "text_sample": " ".join(texts[:4]),
     }
 
 
+def _drain_writes(writes: SimpleQueue, errors: List[OSError]) -> None:
+    while True:
+        item = writes.get()
+        if item is None:
+            return
+        output_path, data = item
+        try:
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            output_path.write_bytes(data)
+        except OSError as exc:
+            errors.append(exc)
+
+
 class ASRProcessor:
     def __init__(self, config: Dict, logger):
         self.logger = logger
@@ -174,7 +288,13 @@ class ASRProcessor:
         requested_device = self.asr_cfg.get("device", "auto")
         self.asr_device = resolve_runtime_device(requested_device, logger=self.logger, label="ASR")
         self._model: Optional[WhisperModel] = None
+        self._batched: Any = None
         self._batch_warned = False
+        self._executor: Optional[Any] = None
+        self._executor_key: Optional[Tuple[Any, ...]] = None
+        self._state_dirty = False
+        self._state_last_flush = 0.0
+        self._metrics_cache: Optional[Tuple[Path, Optional[int], Dict[str, Any]]] = None
 
     def load_model(self):  # utilisé par SegmentRefiner
         if self._model is not None:
@@ -183,8 +303,18 @@ class ASRProcessor:
             raise PipelineError(f"faster-whisper non disponible: {IMPORT_ERROR}")
         compute_type = self.asr_cfg.get("compute_type", "auto")
         self.logger.info("Chargement modèle Faster-Whisper (%s)", self.model_name)
+        model_kwargs: Dict[str, Any] = {}
+        if self._uses_gpu_threads():
+            # one CTranslate2 model spread over every GPU, shared by the ASR threads;
+            # num_workers is per device, so the model holds gpu_count * num_workers replicas
+            model_kwargs = {
+                "device_index": list(range(self._gpu_count())),
+                "num_workers": self._gpu_workers_per_device(),
+            }
         try:
-            self._model = WhisperModel(self.model_name, device=self.asr_device, compute_type=compute_type)
+            self._model = WhisperModel(
+                self.model_name, device=self.asr_device, compute_type=compute_type, **model_kwargs
+            )
         except ValueError as exc:
             raise PipelineError(f"Chargement Faster-Whisper impossible: {exc}") from exc
         return self._model
@@ -192,6 +322,72 @@ class ASRProcessor:
     def ensure_model_cached(self) -> None:
         self.load_model()
 
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+        self._executor = None
+        self._executor_key = None
+
+    def _get_executor(self, worker_env: Dict[str, str], model_opts: Dict[str, Any], logs_dir: Path):
+        # the pool outlives run(): workers keep their WhisperModel loaded between invocations,
+        # so it is keyed on the full-run size; run() caps the jobs in flight instead
+        kind = "threads" if self._uses_gpu_threads() else "processes"
+        if kind == "threads":
+            # as many threads as the shared model has CTranslate2 replicas, so none queue and none idle
+            worker_count, cpu_slices = self._gpu_pool_size(), []
+        else:
+            pool_plan = self._pool_plan()
+            worker_count, cpu_slices = pool_plan.count, pool_plan.cpu_slices
+        key = (
+            kind,
+            worker_count,
+            tuple(sorted(worker_env.items())),
+            tuple(sorted(model_opts.items())),
+            tuple(tuple(cpus) for cpus in cpu_slices),
+        )
+        if self._executor is not None and self._executor_key == key:
+            return self._executor
+        self.close()
+        if kind == "threads":
+            self._executor = ThreadPoolExecutor(max_workers=worker_count, thread_name_prefix="asr")
+        else:
+            self._executor = ProcessPoolExecutor(
+                max_workers=worker_count,
+                initializer=_worker_bootstrap,
+                initargs=(worker_env, str(logs_dir), model_opts, cpu_slices, multiprocessing.Value("i", 0)),
+            )
+        self._executor_key = key
+        return self._executor
+
+    def _uses_gpu_threads(self) -> bool:
+        return "cuda" in str(self.asr_device or "").lower()
+
+    def _gpu_count(self) -> int:
+        try:
+            import torch  # type: ignore
+        except ImportError:  # pragma: no cover - CPU only
+            return 1
+        try:
+            return max(1, int(torch.cuda.device_count()))
+        except Exception:
+            return 1
+
+    def _pool_plan(self) -> WorkerPlan:
+        # same resolution and clamps as the per-run plan, minus the pending-segment count
+        return self._resolve_worker_count(POOL_SEGMENT_HINT)
+
+    def _gpu_workers_per_device(self) -> int:
+        return self._pool_plan().count
+
+    def _gpu_pool_size(self) -> int:
+        return self._gpu_count() * self._gpu_workers_per_device()
+
+    def _shared_gpu_models(self) -> Tuple[WhisperModel, Any]:
+        model = self.load_model()
+        if self._batched is None and BatchedInferencePipeline is not None and self.asr_cfg.get("batch_size"):
+            self._batched = BatchedInferencePipeline(model=model)
+        return model, self._batched
+
     def estimate_worker_count(self) -> int:
         return self._resolve_worker_count().count
 
@@ -249,6 +445,11 @@ class ASRProcessor:
 
         worker_plan = self._resolve_worker_count(len(pending))
         worker_count = worker_plan.count
+        if self._uses_gpu_threads():
+            # every GPU runs its own CTranslate2 workers: keep all of them fed
+            worker_count = min(len(pending), self._gpu_pool_size())
+        else:
+            worker_count = min(worker_count, self._pool_plan().count)
         decoder_cfg = self._decoder_options(initial_prompt)
         worker_env = self._blas_env()
         model_opts = {
@@ -274,76 +475,110 @@ class ASRProcessor:
         processed = 0
         retry_events = 0
         failed_segments: List[int] = []
-        with ProcessPoolExecutor(
-            max_workers=worker_count,
-            initializer=_worker_bootstrap,
-            initargs=(worker_env, str(logs_dir), model_opts),
-        ) as executor:
-            try:
-                while queue or inflight:
-                    while queue and len(inflight) < worker_count:
-                        job = queue.popleft()
-                        payload = {
-                            "index": job.index,
-                            "start_ms": job.start_ms,
-                            "end_ms": job.end_ms,
-                            "audio_path": str(job.audio_path),
-                            "output_path": str(job.output_path),
-                            "language": language_hint,
-                            "initial_prompt": decoder_cfg.get("initial_prompt"),
-                        }
-                        future = executor.submit(_transcribe_segment, payload, decoder_cfg)
-                        inflight[future] = job
-                        self._update_state(state, job.index, "IN_PROGRESS", job.retries, state_path)
-                    if not inflight:
+        language_votes: Counter = Counter()
+        shared_models: Tuple[Any, ...] = ()
+        writer: Optional[threading.Thread] = None
+        write_errors: List[OSError] = []
+        if self._uses_gpu_threads():
+            # decode threads hand their JSONL to one writer thread and move on to the next segment
+            writes: SimpleQueue = SimpleQueue()
+            writer = threading.Thread(target=_drain_writes, args=(writes, write_errors), name="asr-writer", daemon=True)
+            writer.start()
+            shared_models = (*self._shared_gpu_models(), writes)
+            # the shared model skips the per-job bind in _transcribe_segment: bind this run's log dir here
+            _bind_worker_log(str(logs_dir))
+        executor = self._get_executor(worker_env, model_opts, logs_dir)
+        # futures push themselves here on completion: no rescan of every inflight future
+        completed: SimpleQueue = SimpleQueue()
+        try:
+            while queue or inflight:
+                while queue and len(inflight) < worker_count:
+                    job = queue.popleft()
+                    payload = {
+                        "index": job.index,
+                        "start_ms": job.start_ms,
+                        "end_ms": job.end_ms,
+                        "audio_path": str(job.audio_path),
+                        "output_path": str(job.output_path),
+                        "language": language_hint,
+                        "initial_prompt": decoder_cfg.get("initial_prompt"),
+                        "log_dir": str(logs_dir),
+                    }
+                    future = executor.submit(_transcribe_segment, payload, decoder_cfg, *shared_models)
+                    future.add_done_callback(completed.put)
+                    inflight[future] = job
+                    # in memory only: resume ignores IN_PROGRESS, it is persisted with the next DONE/RETRY/FAILED
+                    self._set_state_entry(state, job.index, "IN_PROGRESS", job.retries)
+                if not inflight:
+                    break
+                try:
+                    done = [completed.get(timeout=STATE_FLUSH_INTERVAL_S)]
+                except Empty:
+                    self._maybe_flush_state(state_path, state)
+                    continue
+                while True:
+                    try:
+                        done.append(completed.get_nowait())
+                    except Empty:
                         break
-                    done, _ = wait(list(inflight.keys()), return_when=FIRST_COMPLETED)
-                    for future in done:
-                        job = inflight.pop(future)
-                        try:
-                            result = future.result()
-                            processed += 1
-                            results.append(result)
-                            self._update_state(state, job.index, "DONE", job.retries, state_path)
-                        except Exception as exc:  # pragma: no cover - surfaced au niveau pipeline
-                            job.retries += 1
-                            if job.retries <= max_retries:
-                                retry_events += 1
-                                self.logger.warning(
-                                    "ASR segment %s en erreur ➜ retry (%d/%d)", job.index, job.retries, max_retries
-                                )
-                                queue.append(job)
-                                self._update_state(state, job.index, "RETRY", job.retries, state_path)
+                for future in done:
+                    job = inflight.pop(future)
+                    try:
+                        result = future.result()
+                        processed += 1
+                        results.append(result)
+                        _count_language_vote(language_votes, result)
+                        self._update_state(state, job.index, "DONE", job.retries, state_path)
+                    except Exception as exc:  # pragma: no cover - surfaced au niveau pipeline
+                        job.retries += 1
+                        if job.retries <= max_retries:
+                            retry_events += 1
+                            self.logger.warning(
+                                "ASR segment %s en erreur ➜ retry (%d/%d)", job.index, job.retries, max_retries
+                            )
+                            queue.append(job)
+                            self._update_state(state, job.index, "RETRY", job.retries, state_path)
+                        else:
+                            failed_segments.append(job.index)
+                            self._update_state(state, job.index, "FAILED", job.retries, state_path)
+                            if fail_fast:
+                                raise PipelineError(
+                                    f"ASR segment {job.index} en échec définitif (voir logs {logs_dir})"
+                                ) from exc
                             else:
-                                failed_segments.append(job.index)
-                                self._update_state(state, job.index, "FAILED", job.retries, state_path)
-                                if fail_fast:
-                                    raise PipelineError(
-                                        f"ASR segment {job.index} en échec définitif (voir logs {logs_dir})"
-                                    ) from exc
-                                else:
-                                    self.logger.error(
-                                        "ASR segment %s en échec définitif (voir logs %s)", job.index, logs_dir
-                                    )
-                                    continue
-            finally:
-                duration = max(time.time() - start_time, 0.0)
-                metrics_payload = self._write_metrics(
-                    work_dir,
-                    {
-                        "segments_total": len(jobs),
-                        "segments_pending": len(pending),
-                        "segments_processed": processed,
-                        "segments_skipped": len(jobs) - len(pending),
-                        "segments_failed": failed_segments,
-                        "worker_count": worker_count,
-                        "retry_events": retry_events,
-                        "duration_sec": round(duration, 2),
-                        "status": "failed" if failed_segments else "ok",
-                    },
-                )
-
-        resolved_lang = self._resolve_language(results, requested_lang, detect_lang)
+                                self.logger.error(
+                                    "ASR segment %s en échec définitif (voir logs %s)", job.index, logs_dir
+                                )
+                                continue
+        except BrokenExecutor:
+            self.close()
+            raise
+        finally:
+            for future in inflight:
+                future.cancel()
+            if writer is not None:
+                writes.put(None)
+                writer.join()
+            self._maybe_flush_state(state_path, state, force=True)
+            duration = max(time.time() - start_time, 0.0)
+            metrics_payload = self._write_metrics(
+                work_dir,
+                {
+                    "segments_total": len(jobs),
+                    "segments_pending": len(pending),
+                    "segments_processed": processed,
+                    "segments_skipped": len(jobs) - len(pending),
+                    "segments_failed": failed_segments,
+                    "worker_count": worker_count,
+                    "retry_events": retry_events,
+                    "duration_sec": round(duration, 2),
+                    "status": "failed" if failed_segments else "ok",
+                },
+            )
+
+        if write_errors:
+            raise PipelineError(f"Écriture JSONL ASR impossible: {write_errors[0]}")
+        resolved_lang = self._resolve_language(results, requested_lang, detect_lang, language_votes)
         return {
             "language": resolved_lang,
             "jsonl_dir": jsonl_dir,
@@ -356,20 +591,38 @@ class ASRProcessor:
 
     def _read_manifest(self, manifest_path: Path, work_dir: Path, jsonl_dir: Path) -> List[SegmentJob]:
         jobs: List[SegmentJob] = []
-        with manifest_path.open("r", encoding="utf-8") as handle:
-            reader = csv.DictReader(handle)
+        with manifest_path.open("r", encoding="utf-8", newline="") as handle:
+            reader = csv.reader(handle)
+            header = next(reader, None)
+            if not header:
+                return jobs
+            try:
+                idx_i, start_i, end_i = (header.index(name) for name in ("index", "start_ms", "end_ms"))
+            except ValueError as exc:
+                raise PipelineError(f"Manifest invalide ({manifest_path}): {exc}") from exc
+            path_i = header.index("path") if "path" in header else None
+            base_dir = manifest_path.parent.resolve()
+            isabs = os.path.isabs
+            make_path = Path
+            make_job = SegmentJob
+            append = jobs.append
+            output_name = "seg_{:05d}.jsonl".format
+            output_in = jsonl_dir.joinpath
+            # one directory listing per segment folder instead of a stat() per row
+            listings: Dict[Path, set] = {}
             for row in reader:
-                idx = int(row["index"])
-                start_ms = int(row["start_ms"])
-                end_ms = int(row["end_ms"])
-                rel_path = row.get("path") or ""
-                audio_path = Path(rel_path)
-                if not audio_path.is_absolute():
-                    audio_path = (manifest_path.parent / audio_path).resolve()
-                if not audio_path.exists():
+                if not row:
+                    continue
+                idx = int(row[idx_i])
+                rel_path = row[path_i] if path_i is not None and path_i < len(row) else ""
+                audio_path = make_path(rel_path) if isabs(rel_path) else base_dir / rel_path
+                parent = audio_path.parent
+                names = listings.get(parent)
+                if names is None:
+                    names = listings[parent] = _listdir_names(parent)
+                if audio_path.name not in names and not audio_path.exists():
                     raise PipelineError(f"Segment audio manquant: {audio_path}")
-                output_path = jsonl_dir / f"seg_{idx:05d}.jsonl"
-                jobs.append(SegmentJob(idx, start_ms, end_ms, audio_path, output_path))
+                append(make_job(idx, int(row[start_i]), int(row[end_i]), audio_path, output_in(output_name(idx))))
         return jobs
 
     def _load_state(self, state_path: Path) -> Dict[str, Any]:
@@ -386,7 +639,13 @@ class ASRProcessor:
     def _filter_jobs(self, jobs: List[SegmentJob], state: Dict[str, Any], force: bool, only_failed: bool) -> List[SegmentJob]:
         pending: List[SegmentJob] = []
         segments_state = state.setdefault("segments", {})
+        listings: Dict[Path, set] = {}
         for job in jobs:
+            parent = job.output_path.parent
+            names = listings.get(parent)
+            if names is None:
+                names = listings[parent] = _listdir_names(parent)
+            output_exists = job.output_path.name in names
             key = str(job.index)
             seg_state = segments_state.setdefault(key, {"status": "PENDING", "retries": 0})
             job.status = seg_state.get("status", "PENDING")
@@ -396,49 +655,76 @@ class ASRProcessor:
                 continue
             if only_failed:
                 if job.status == "FAILED":
-                    if job.output_path.exists():
+                    if output_exists:
                         job.output_path.unlink(missing_ok=True)
                     pending.append(job)
                 continue
-            if job.output_path.exists() and job.status == "DONE":
+            if output_exists and job.status == "DONE":
                 continue
-            if job.output_path.exists():
+            if output_exists:
                 seg_state.update({"status": "DONE", "retries": job.retries})
                 continue
             pending.append(job)
         return pending
 
     def _update_state(self, state: Dict[str, Any], index: int, status: str, retries: int, path: Path) -> None:
+        self._set_state_entry(state, index, status, retries)
+        self._state_dirty = True
+        self._maybe_flush_state(path, state)
+
+    def _set_state_entry(self, state: Dict[str, Any], index: int, status: str, retries: int) -> None:
         entry = state.setdefault("segments", {}).setdefault(str(index), {})
         entry.update({
             "status": status,
             "retries": retries,
             "updated_at": datetime.utcnow().isoformat() + "Z",
         })
+
+    def _maybe_flush_state(self, path: Path, state: Dict[str, Any], force: bool = False) -> None:
+        if not self._state_dirty:
+            return
+        if not force and time.monotonic() - self._state_last_flush < STATE_FLUSH_INTERVAL_S:
+            return
         self._save_state(path, state)
 
     def _save_state(self, path: Path, payload: Dict[str, Any]) -> None:
         path.parent.mkdir(parents=True, exist_ok=True)
-        write_json(path, payload, indent=2)
+        # write-then-rename: a crash mid-write must not leave a truncated state (resume would restart from zero)
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        write_json_fast(tmp_path, payload)
+        os.replace(tmp_path, path)
+        self._state_dirty = False
+        self._state_last_flush = time.monotonic()
 
     def _decoder_options(self, initial_prompt: Optional[str]) -> Dict[str, Any]:
         cfg = self.asr_cfg
         batch_size = cfg.get("batch_size")
-        if batch_size not in (None, 0) and not self._batch_warned:
-            self.logger.warning("Paramètre 'asr.batch_size' ignoré (non supporté par faster-whisper).")
-            self._batch_warned = True
-        chunk_length = self._sanitize_chunk_length(cfg.get("chunk_length"))
+        if batch_size not in (None, 0) and BatchedInferencePipeline is None:
+            if not self._batch_warned:
+                self.logger.warning("Paramètre 'asr.batch_size' ignoré (BatchedInferencePipeline indisponible).")
+                self._batch_warned = True
+            batch_size = None
+        temperature = float(cfg.get("temperature", 0.0))
+        fallback = cfg.get("temperature_fallback")
+        if fallback:
+            temperature = (temperature, temperature + float(fallback))
+        candidates = {
+            "beam_size": int(cfg.get("beam_size", 1)),
+            "best_of": int(cfg.get("best_of", 1)),
+            "vad_filter": bool(cfg.get("vad_filter", False)),
+            "chunk_length": self._sanitize_chunk_length(cfg.get("chunk_length")),
+            "word_timestamps": bool(cfg.get("word_timestamps", False)),
+            "condition_on_previous_text": bool(cfg.get("condition_on_previous_text", False)),
+            "no_speech_threshold": float(cfg.get("no_speech_threshold", 0.6)),
+            "temperature": temperature,
+        }
         return {
-            "temperature": cfg.get("temperature", 0.0),
-            "temperature_fallback": cfg.get("temperature_fallback"),
-            "beam_size": cfg.get("beam_size", 1),
-            "best_of": cfg.get("best_of", 1),
-            "vad_filter": cfg.get("vad_filter", False),
-            "chunk_length": chunk_length,
-            "word_timestamps": cfg.get("word_timestamps", False),
-            "condition_on_previous_text": cfg.get("condition_on_previous_text", False),
-            "no_speech_threshold": cfg.get("no_speech_threshold", 0.6),
+            # filtered once per run; workers only overlay language / initial_prompt
+            "transcribe_kwargs": {
+                key: value for key, value in candidates.items() if key in _TRANSCRIBE_KWARGS and value is not None
+            },
             "initial_prompt": initial_prompt or cfg.get("initial_prompt"),
+            "batch_size": int(batch_size) if batch_size not in (None, 0) else None,
         }
 
     def _sanitize_chunk_length(self, raw_value: Any) -> Optional[int]:
@@ -483,8 +769,21 @@ class ASRProcessor:
             note=note,
             clamped_from=initial if clamp_notes else None,
             clamp_notes=clamp_notes,
+            cpu_slices=self._cpu_slices(resolved),
         )
 
+    def _cpu_slices(self, worker_count: int) -> List[List[int]]:
+        """Disjoint CPU sets (one per worker) used to pin CPU workers on Linux."""
+        if self._uses_gpu_threads() or not self.asr_cfg.get("pin_cpus", True):
+            return []
+        if not hasattr(os, "sched_getaffinity") or worker_count < 2:
+            return []
+        available = [cpu for cpu in sorted(os.sched_getaffinity(0)) if _is_primary_thread(cpu)]
+        if len(available) < worker_count:
+            return []
+        size = len(available) // worker_count
+        return [available[slot * size : (slot + 1) * size] for slot in range(worker_count)]
+
     def _physical_cores(self) -> Optional[int]:
         try:
             import psutil  # type: ignore
@@ -605,13 +904,16 @@ class ASRProcessor:
         results: List[Dict[str, Any]],
         requested_lang: str,
         detect_lang: bool,
+        votes: Optional[Counter] = None,
     ) -> str:
         if requested_lang and requested_lang != "auto":
             return requested_lang
-        detected = [res.get("language") for res in results if res.get("language") not in (None, "", "auto")]
-        if detected:
-            winner = Counter(detected).most_common(1)[0][0]
-            return winner
+        if votes is None:
+            votes = Counter()
+            for res in results:
+                _count_language_vote(votes, res)
+        if votes:
+            return votes.most_common(1)[0][0]
         if detect_lang and results:
             sample = " ".join(res.get("text_sample", "") for res in results[:5]).strip()
             lang = detect_language(sample) if sample else None
@@ -622,7 +924,15 @@ class ASRProcessor:
     def _write_metrics(self, work_dir: Path, metrics: Dict[str, Any]) -> Dict[str, Any]:
         metrics_path = work_dir / "logs" / "metrics.json"
         payload: Dict[str, Any]
-        if metrics_path.exists():
+        try:
+            mtime_ns = metrics_path.stat().st_mtime_ns
+        except OSError:
+            mtime_ns = None
+        cached = self._metrics_cache
+        if cached is not None and cached[0] == metrics_path and cached[1] == mtime_ns:
+            # file untouched since our last write (the pipeline also stores its own section there)
+            payload = cached[2]
+        elif mtime_ns is not None:
             try:
                 payload = read_json(metrics_path)
             except Exception:
@@ -631,5 +941,6 @@ class ASRProcessor:
             payload = {}
         metrics.setdefault("timestamp", datetime.utcnow().isoformat() + "Z")
         payload["asr"] = metrics
-        write_json(metrics_path, payload, indent=2)
+        write_json_fast(metrics_path, payload)
+        self._metrics_cache = (metrics_path, metrics_path.stat().st_mtime_ns, payload)
         return metrics
@@ -1,6 +1,7 @@
 import datetime as dt
+from itertools import chain
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 
 
 class AuditReporter:
@@ -24,75 +25,68 @@ class AuditReporter:
         glossary_conflicts: Optional[List[Dict[str, str]]] = None,
     ) -> str:
         timestamp = dt.datetime.now(dt.UTC).isoformat(timespec="seconds").replace("+00:00", "Z")
-        lines: List[str] = [f"# Audit post-traitement — {media_name}", f"_Généré le {timestamp} (langue: {language})_"]
+        sections: List[Iterable[str]] = [
+            (f"# Audit post-traitement — {media_name}", f"_Généré le {timestamp} (langue: {language})_")
+        ]
 
         if clean_report:
-            lines.extend(self._render_clean_report(clean_report))
+            sections.append(self._render_clean_report(clean_report))
         if polish_report:
-            lines.extend(self._render_polish_report(polish_report))
+            sections.append(self._render_polish_report(polish_report))
         if structure:
-            lines.extend(self._render_structure_report(structure, chunks))
+            sections.append(self._render_structure_report(structure, chunks))
         if metrics:
-            lines.extend(self._render_metrics(metrics))
+            sections.append(self._render_metrics(metrics))
         if low_conf_entries is not None:
-            lines.extend(self._render_low_conf(low_conf_entries, low_conf_path))
+            sections.append(self._render_low_conf(low_conf_entries, low_conf_path))
         if clean_report:
-            lines.extend(self._render_review_section(clean_report))
-            glossary = clean_report.get("glossary") or []
-            if glossary:
-                lines.append("## Glossaire dynamique")
-                for entry in glossary[: self.max_examples]:
-                    lines.append(f"- {entry}")
+            sections.append(self._render_review_section(clean_report))
+            sections.append(self._render_glossary(clean_report.get("glossary") or []))
         if glossary_conflicts:
-            lines.append("## Conflits glossary (mode strict)")
-            for conflict in glossary_conflicts[: self.max_examples]:
-                lines.append(f"- `{conflict.get('word')}` vs `{conflict.get('preferred')}` → correction ignorée")
-        return "\n".join(lines).strip() + "\n"
+            sections.append(self._render_glossary_conflicts(glossary_conflicts))
+        return "\n".join(chain.from_iterable(sections)).strip() + "\n"
 
-    def _render_clean_report(self, report: Dict[str, Any]) -> List[str]:
-        lines = ["## Nettoyage (Cleaner)"]
-        lines.append(
+    def _render_clean_report(self, report: Dict[str, Any]) -> Iterator[str]:
+        yield "## Nettoyage (Cleaner)"
+        yield (
             f"- Segments: {report.get('input_segments', 0)} ➜ {report.get('output_segments', 0)} "
             f"(fusions courtes: {report.get('short_merges', 0)})"
         )
-        lines.append(
+        yield (
             f"- Fillers supprimés: {report.get('fillers_removed', 0)} · corrections: {report.get('auto_corrections', 0)} "
             f"· redondances filtrées: {report.get('redundant_segments', 0)} "
             f"(garde-fous: {report.get('redundancy_guarded', 0)})"
         )
-        lines.append(
+        yield (
             f"- Segments supprimés: {report.get('dropped_segments', 0)} · low-conf: {report.get('low_confidence_segments', 0)}"
         )
-        return lines
 
-    def _render_polish_report(self, report: Dict[str, Any]) -> List[str]:
-        lines = ["## Polish (lecture)"]
-        lines.append(
+    def _render_polish_report(self, report: Dict[str, Any]) -> Iterator[str]:
+        yield "## Polish (lecture)"
+        yield (
             f"- Segments: {report.get('input_segments', 0)} ➜ {report.get('output_segments', report.get('input_segments', 0))}"
         )
-        lines.append(
+        yield (
             f"- Jointures courtes: {report.get('joined_segments', 0)} · marqueurs oraux supprimés: {report.get('oral_markers_removed', 0)} "
             f"· découpes phrases: {report.get('sentence_splits', 0)}"
         )
-        return lines
 
-    def _render_structure_report(self, structure: Dict[str, Any], chunks: Optional[List[Dict[str, Any]]]) -> List[str]:
+    def _render_structure_report(self, structure: Dict[str, Any], chunks: Optional[List[Dict[str, Any]]]) -> Iterator[str]:
         sections = structure.get("sections", [])
-        lines = ["## Structuration & chunking"]
-        lines.append(f"- Sections: {len(sections)} · langue détectée: {structure.get('language')}")
+        yield "## Structuration & chunking"
+        yield f"- Sections: {len(sections)} · langue détectée: {structure.get('language')}"
         if sections:
             avg_sentences = sum(sec.get("metadata", {}).get("sentence_count", 0) for sec in sections) / len(sections)
-            lines.append(f"- Phrases moy./section: {avg_sentences:.1f}")
+            yield f"- Phrases moy./section: {avg_sentences:.1f}"
         if chunks:
             token_counts = [chunk.get("token_count", 0) for chunk in chunks]
             if token_counts:
                 avg_tokens = sum(token_counts) / len(token_counts)
                 max_tokens = max(token_counts)
-                lines.append(f"- Chunks: {len(chunks)} · tokens moyen: {avg_tokens:.0f} · max: {max_tokens}")
-        return lines
+                yield f"- Chunks: {len(chunks)} · tokens moyen: {avg_tokens:.0f} · max: {max_tokens}"
 
-    def _render_metrics(self, metrics: Dict[str, Any]) -> List[str]:
-        lines = ["## Métriques"]
+    def _render_metrics(self, metrics: Dict[str, Any]) -> Iterator[str]:
+        yield "## Métriques"
         rows = {
             "Tokens total": metrics.get("tokens_total"),
             "Phrases total": metrics.get("phrases_total"),
@@ -100,50 +94,57 @@ class AuditReporter:
             "Chunks confidence moyenne": metrics.get("chunk_confidence_mean"),
             "Low-conf spans": metrics.get("low_conf_count"),
         }
-        lines.append("| Indicateur | Valeur |")
-        lines.append("| --- | --- |")
+        yield "| Indicateur | Valeur |"
+        yield "| --- | --- |"
         for key, value in rows.items():
-            lines.append(f"| {key} | {value if value is not None else '—'} |")
+            yield f"| {key} | {value if value is not None else '—'} |"
         sparkline = metrics.get("sparkline")
         if sparkline:
-            lines.append("")
-            lines.append(f"Confiance globale : `{sparkline}`")
-        return lines
+            yield ""
+            yield f"Confiance globale : `{sparkline}`"
 
-    def _render_low_conf(self, entries: List[Dict[str, Any]], low_conf_path: Optional[Path]) -> List[str]:
-        lines: List[str] = []
+    def _render_low_conf(self, entries: List[Dict[str, Any]], low_conf_path: Optional[Path]) -> Iterator[str]:
         if not entries and not low_conf_path:
-            return lines
-        lines.append("## File low-confidence")
+            return
+        yield "## File low-confidence"
         if low_conf_path:
-            lines.append(f"- JSONL ➜ `{low_conf_path.name}`")
+            yield f"- JSONL ➜ `{low_conf_path.name}`"
         for entry in entries[: self.max_examples]:
             start = entry.get("ts_start")
             end = entry.get("ts_end")
             reason = entry.get("reason")
             text = (entry.get("text_human") or entry.get("text_machine") or "")[:120]
-            lines.append(f"- `{entry.get('id')}` t={start:.2f}s→{end:.2f}s ({reason}) · {text}")
-        return lines
+            yield f"- `{entry.get('id')}` t={start:.2f}s→{end:.2f}s ({reason}) · {text}"
 
-    def _render_review_section(self, report: Dict[str, Any]) -> List[str]:
+    def _render_review_section(self, report: Dict[str, Any]) -> Iterator[str]:
         examples = report.get("examples", {}).get("low_confidence") or []
         redundant = report.get("examples", {}).get("redundant") or []
         dropped = report.get("examples", {}).get("dropped") or []
-        lines: List[str] = []
         if not (examples or redundant or dropped):
-            return lines
-        lines.append("## Zones à relire")
+            return
+        yield "## Zones à relire"
         if examples:
-            lines.append("### Segments à faible confiance")
+            yield "### Segments à faible confiance"
             for item in examples[: self.max_examples]:
-                lines.append(f"- t={item.get('start', '?')}s · score={item.get('score', '?')}")
+                yield f"- t={item.get('start', '?')}s · score={item.get('score', '?')}"
         if redundant:
-            lines.append("### Segments redondants filtrés")
+            yield "### Segments redondants filtrés"
             for item in redundant[: self.max_examples]:
                 preview = (item.get("text") or "")[:80]
-                lines.append(f"- t={item.get('start', '?')}s · \"{preview}\"")
+                yield f"- t={item.get('start', '?')}s · \"{preview}\""
         if dropped:
-            lines.append("### Segments supprimés")
+            yield "### Segments supprimés"
             for item in dropped[: self.max_examples]:
-                lines.append(f"- t={item.get('start', '?')}s · raison={item.get('reason', 'n/a')}")
-        return lines
+                yield f"- t={item.get('start', '?')}s · raison={item.get('reason', 'n/a')}"
+
+    def _render_glossary(self, glossary: List[str]) -> Iterator[str]:
+        if not glossary:
+            return
+        yield "## Glossaire dynamique"
+        for entry in glossary[: self.max_examples]:
+            yield f"- {entry}"
+
+    def _render_glossary_conflicts(self, conflicts: List[Dict[str, str]]) -> Iterator[str]:
+        yield "## Conflits glossary (mode strict)"
+        for conflict in conflicts[: self.max_examples]:
+            yield f"- `{conflict.get('word')}` vs `{conflict.get('preferred')}` → correction ignorée"
@@ -1,11 +1,40 @@
+import heapq
 import math
+import operator
+import sys
+from bisect import bisect_left
+from collections import Counter
+from itertools import accumulate
 from typing import Any, Dict, List, Optional, Tuple
 
-from textnorm import join_text
-
 from utils import stable_id
 
 
+def _chunk_windows(
+    tokens: List[int], close_tokens: int, min_sentences: int, overlap: int
+) -> List[Tuple[int, int, int]]:
+    """Return (start, end, carried) sentence windows, the last one possibly below the close threshold."""
+    # token counts are positive, so the prefix sums are sorted and each close point is one bisect away
+    prefix = [0, *accumulate(tokens)]
+    total = len(tokens)
+    windows: List[Tuple[int, int, int]] = []
+    start = 0
+    carried = 0
+    lowest_end = 1
+    while True:
+        end = bisect_left(prefix, prefix[start] + close_tokens, max(start + min_sentences, lowest_end))
+        if end > total:
+            break
+        windows.append((start, end, carried))
+        carried = min(overlap, end - start)
+        start = end - carried
+        # a chunk only closes after taking in at least one new sentence
+        lowest_end = end + 1
+    if start < total:
+        windows.append((start, total, carried))
+    return windows
+
+
 class Chunker:
     def __init__(self, cfg: Dict[str, Any], logger):
         self.cfg = cfg or {}
@@ -17,133 +46,151 @@ class Chunker:
         self.min_sentences = max(1, int(self.cfg.get("min_sentences", 2)))
         self.overlap_sentences = max(0, int(self.cfg.get("overlap_sentences", 1)))
         self.low_span_threshold = float(self.cfg.get("low_span_threshold", 0.3))
+        # a chunk closes once it reaches min_tokens and either the target or the hard cap
+        self.close_tokens = max(self.min_tokens, min(self.target_tokens, self.max_tokens))
 
     def run(self, structure: Dict[str, Any], language: str, document_id: str) -> List[Dict[str, Any]]:
         if not self.enabled:
             return []
-        sentences = self._collect_sentences(structure)
+        sentences, tokens, section_indices, speakers = self._collect_sentences(structure)
         if not sentences:
             return []
-        chunks = self._build_chunks(sentences, language, document_id)
+        chunks = self._build_chunks(sentences, tokens, section_indices, speakers, language, document_id)
         self.logger.info("Chunker: %d phrases ➜ %d blocs (%s)", len(sentences), len(chunks), language)
         return chunks
 
-    def _collect_sentences(self, structure: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _collect_sentences(
+        self, structure: Dict[str, Any]
+    ) -> Tuple[List[Dict[str, Any]], List[int], List[Any], List[str]]:
+        # sentences are referenced, not copied: token estimates, section indices and speakers live in parallel lists
         sentences: List[Dict[str, Any]] = []
+        tokens: List[int] = []
+        section_indices: List[Any] = []
+        speakers: List[str] = []
+        estimate = self._estimate_tokens
         for section in structure.get("sections", []):
+            section_index = section.get("index")
             for sentence in section.get("sentences", []):
-                enriched = dict(sentence)
-                enriched["section_index"] = section.get("index")
-                sentences.append(enriched)
-        return sentences
+                sentences.append(sentence)
+                tokens.append(sentence.get("tokens") or estimate(sentence.get("text", "")))
+                section_indices.append(section_index)
+                # interned labels make the histogram and switch comparisons identity checks
+                speakers.append(sys.intern(sentence.get("speaker") or "SPEAKER_00"))
+        return sentences, tokens, section_indices, speakers
 
-    def _build_chunks(self, sentences: List[Dict[str, Any]], language: str, document_id: str) -> List[Dict[str, Any]]:
+    def _build_chunks(
+        self,
+        sentences: List[Dict[str, Any]],
+        tokens: List[int],
+        section_indices: List[Any],
+        speakers: List[str],
+        language: str,
+        document_id: str,
+    ) -> List[Dict[str, Any]]:
+        # chunks are index windows over `sentences`; carried overlap is a leading count, not copies
         chunks: List[Dict[str, Any]] = []
-        buffer: List[Dict[str, Any]] = []
-        token_total = 0
-        chunk_index = 0
         last_chunk_id: Optional[str] = None
-
-        for sentence in sentences:
-            enriched = dict(sentence)
-            enriched["tokens"] = enriched.get("tokens") or self._estimate_tokens(enriched.get("text", ""))
-            buffer.append(enriched)
-            token_total += enriched["tokens"]
-            if self._should_close_chunk(buffer, token_total):
-                chunk = self._make_chunk(chunk_index, buffer, language, document_id, last_chunk_id)
-                chunk_index += 1
-                chunks.append(chunk)
-                last_chunk_id = chunk["id"]
-                buffer, token_total = self._carry_overlap(buffer, last_chunk_id)
-
-        if buffer:
-            chunks.append(self._make_chunk(chunk_index, buffer, language, document_id, last_chunk_id))
+        windows = _chunk_windows(tokens, self.close_tokens, self.min_sentences, self.overlap_sentences)
+        for chunk_index, (window_start, window_end, carried) in enumerate(windows):
+            chunk = self._make_chunk(
+                chunk_index,
+                sentences[window_start:window_end],
+                tokens[window_start:window_end],
+                section_indices[window_start:window_end],
+                speakers[window_start:window_end],
+                language,
+                document_id,
+                last_chunk_id,
+                carried,
+            )
+            chunks.append(chunk)
+            last_chunk_id = chunk["id"]
         return chunks
 
-    def _should_close_chunk(self, buffer: List[Dict[str, Any]], token_total: int) -> bool:
-        if not buffer:
-            return False
-        if len(buffer) < self.min_sentences:
-            return False
-        if token_total < self.min_tokens:
-            return False
-        if token_total >= self.max_tokens:
-            return True
-        if token_total >= self.target_tokens:
-            return True
-        return False
-
-    def _carry_overlap(self, buffer: List[Dict[str, Any]], parent_chunk_id: Optional[str]) -> Tuple[List[Dict[str, Any]], int]:
-        if self.overlap_sentences <= 0:
-            return [], 0
-        overlap = buffer[-self.overlap_sentences :] if len(buffer) >= self.overlap_sentences else buffer[:]
-        carried: List[Dict[str, Any]] = []
-        for sentence in overlap:
-            duplicated = dict(sentence)
-            duplicated["overlap"] = True
-            if parent_chunk_id:
-                duplicated["parent_chunk_id"] = parent_chunk_id
-            carried.append(duplicated)
-        token_total = sum(sentence["tokens"] for sentence in carried)
-        return carried, token_total
-
     def _make_chunk(
         self,
         index: int,
         sentences: List[Dict[str, Any]],
+        tokens: List[int],
+        section_indices: List[Any],
+        speakers: List[str],
         language: str,
         document_id: str,
         last_chunk_id: Optional[str],
+        overlap_count: int = 0,
     ) -> Dict[str, Any]:
         start = sentences[0].get("start", 0.0)
         end = sentences[-1].get("end", start)
-        speaker_histogram: Dict[str, int] = {}
         text_parts: List[str] = []
         text_machine_parts: List[str] = []
         section_ids: set = set()
         token_total = 0
         low_duration_total = 0.0
         confidence_values: List[float] = []
-        tokens_weighted: List[Tuple[float, int]] = []
-        speaker_sequence: List[str] = []
-        for sentence in sentences:
-            speaker = sentence.get("speaker") or "SPEAKER_00"
-            speaker_histogram[speaker] = speaker_histogram.get(speaker, 0) + 1
-            speaker_sequence.append(speaker)
-            section_id = sentence.get("section_id") or sentence.get("section_index")
+        weighted_sum = 0.0
+        weight_total = 0
+        sentence_rows: List[Dict[str, Any]] = []
+        add_text = text_parts.append
+        add_text_machine = text_machine_parts.append
+        add_confidence = confidence_values.append
+        add_row = sentence_rows.append
+        # one pass: aggregates and the per-sentence rows of the chunk payload, one lookup per key
+        for position, sentence in enumerate(sentences):
+            get = sentence.get
+            raw_section_id = get("section_id")
+            section_id = raw_section_id or section_indices[position]
             if section_id is not None:
                 section_ids.add(str(section_id))
-            token_total += sentence.get("tokens", 0)
-            snippet = sentence.get("text", "").strip()
-            snippet_machine = sentence.get("text_machine", "").strip()
+            token_count = tokens[position]
+            token_total += token_count
+            # the first `overlap_count` sentences were carried over from the previous chunk
+            overlap = position < overlap_count
+            text = get("text")
+            snippet = (text or "").strip()
+            snippet_machine = (get("text_machine") or "").strip()
             if snippet:
-                text_parts.append(snippet)
+                add_text(snippet)
             if snippet_machine:
-                text_machine_parts.append(snippet_machine)
-            confidence = sentence.get("confidence_mean")
+                add_text_machine(snippet_machine)
+            confidence = get("confidence_mean")
             if confidence is not None:
-                confidence_values.append(confidence)
-                tokens_weighted.append((confidence, max(1, sentence.get("tokens", 1))))
-            low_duration_total += sentence.get("low_duration", 0.0)
-        chunk_text = join_text(text_parts)
-        chunk_text_machine = join_text(text_machine_parts)
+                add_confidence(confidence)
+                weight = max(1, token_count)
+                weighted_sum += confidence * weight
+                weight_total += weight
+            low_duration = get("low_duration")
+            low_duration_total += low_duration or 0.0
+            add_row(
+                {
+                    "text": text,
+                    "start": get("start"),
+                    "end": get("end"),
+                    "speaker": get("speaker"),
+                    "tokens": token_count,
+                    "overlap": overlap,
+                    "section_id": raw_section_id,
+                    "confidence_mean": confidence,
+                    "confidence_p05": get("confidence_p05"),
+                    "low_duration": low_duration,
+                }
+            )
+        # parts are already stripped and non-empty, so a plain join matches join_text
+        chunk_text = " ".join(text_parts)
+        chunk_text_machine = " ".join(text_machine_parts)
         duration = round(float(end) - float(start), 3)
-        speaker_majority = max(speaker_histogram.items(), key=lambda item: item[1])[0] if speaker_histogram else "SPEAKER_00"
-        speaker_switches = sum(1 for i in range(1, len(speaker_sequence)) if speaker_sequence[i] != speaker_sequence[i - 1])
+        speaker_histogram = Counter(speakers)
+        speaker_majority = speaker_histogram.most_common(1)[0][0] if speaker_histogram else "SPEAKER_00"
+        speaker_switches = sum(map(operator.ne, speakers, speakers[1:]))
         chunk_id = stable_id(document_id, start, end, speaker_majority)
-        confidence_mean = (
-            round(sum(val * weight for val, weight in tokens_weighted) / sum(weight for _, weight in tokens_weighted), 3)
-            if tokens_weighted
-            else None
-        )
-        confidence_values.sort()
-        confidence_p05 = (
-            round(confidence_values[int(len(confidence_values) * 0.05)], 3) if confidence_values else None
-        )
+        confidence_mean = round(weighted_sum / weight_total, 3) if weight_total else None
+        confidence_p05 = None
+        if confidence_values:
+            # only the 5th-percentile order statistic is needed, not a full sort
+            rank = int(len(confidence_values) * 0.05)
+            confidence_p05 = round(heapq.nsmallest(rank + 1, confidence_values)[-1], 3)
         low_span_ratio = round(min(1.0, max(0.0, low_duration_total / duration)), 3) if duration > 0 else 0.0
-        parent_ids_prev = sorted(
-            {sentence.get("parent_chunk_id") for sentence in sentences if sentence.get("overlap") and sentence.get("parent_chunk_id")}
-        )
+        # carried sentences all come from the previous chunk, so it is the only possible parent
+        parent_ids_prev = [last_chunk_id] if overlap_count and last_chunk_id else []
         return {
             "schema_version": "1.0.0",
             "id": chunk_id,
@@ -159,28 +206,14 @@ class Chunker:
             "parent_ids_prev": parent_ids_prev,
             "speaker_majority": speaker_majority,
             "speaker_switches": speaker_switches,
-            "speakers": speaker_histogram,
+            "speakers": dict(speaker_histogram),
             "text_human": chunk_text,
             "text_machine": chunk_text_machine,
             "overlap_sentences": self.overlap_sentences,
             "confidence_mean": confidence_mean,
             "confidence_p05": confidence_p05,
             "low_span_ratio": low_span_ratio,
-            "sentences": [
-                {
-                    "text": sentence.get("text"),
-                    "start": sentence.get("start"),
-                    "end": sentence.get("end"),
-                    "speaker": sentence.get("speaker"),
-                    "tokens": sentence.get("tokens"),
-                    "overlap": bool(sentence.get("overlap")),
-                    "section_id": sentence.get("section_id"),
-                    "confidence_mean": sentence.get("confidence_mean"),
-                    "confidence_p05": sentence.get("confidence_p05"),
-                    "low_duration": sentence.get("low_duration"),
-                }
-                for sentence in sentences
-            ],
+            "sentences": sentence_rows,
         }
 
     def _estimate_tokens(self, text: Optional[str]) -> int:
@@ -1,13 +1,64 @@
+import copy
+import os
 import re
 import unicodedata
 from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from difflib import SequenceMatcher
-from typing import Any, Deque, Dict, List, Optional, Tuple
+from itertools import repeat
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
 
 from glossary import GlossaryManager
 from textnorm import TextNormalizer, join_text
 
-WORD_REPEAT_PATTERN = re.compile(r"\b([\w'’\-]+)(\s+\1\b)+", re.IGNORECASE)
+# possessive word match: a shorter prefix can never be followed by \s, so backtracking into it is wasted
+WORD_REPEAT_PATTERN = re.compile(r"\b([\w'’\-]++)(\s+\1\b)+", re.IGNORECASE)
+APOSTROPHE_TRANSLATION = str.maketrans({"’": "'", "`": "'"})
+# whitespace before an apostrophe shrinks to one space, whitespace after it is dropped
+APOSTROPHE_SPACING_PATTERN = re.compile(r"\s+'\s*|'\s+")
+# space before closing punctuation or after an opening guillemet; the unmatched group expands to ""
+PUNCT_SPACING_PATTERN = re.compile(r"\s+([,;:.!?»])|(«)\s+")
+# after the whitespace collapse the pattern can only match one of these pairs: a cheap gate
+PUNCT_SPACING_ANCHORS = (" ,", " ;", " :", " .", " !", " ?", " »", "« ")
+SIMILARITY_STRIP_PATTERN = re.compile(r"[^a-z0-9à-öø-ÿ\s]")
+
+PARALLEL_CHUNKSIZE = 64
+
+_WORKER_CLEANER: Optional["Cleaner"] = None
+
+
+def _init_clean_worker(cleaner: "Cleaner") -> None:
+    global _WORKER_CLEANER
+    _WORKER_CLEANER = cleaner
+
+
+def _prepare_in_worker(seg: Dict, language: str) -> Tuple[Any, ...]:
+    return _WORKER_CLEANER._prepare_segment(seg, language)
+
+
+def _apostrophe_spacing(match: re.Match) -> str:
+    return "'" if match.group().startswith("'") else " '"
+
+
+def _trie_alternation(words: List[str]) -> str:
+    """Factor words into a prefix-trie regex body (longest match preferred at each position)."""
+    trie: Dict[str, Any] = {}
+    for word in words:
+        if not word:
+            continue
+        node = trie
+        for char in word.lower():
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def render(node: Dict[str, Any]) -> str:
+        branches = [re.escape(char) + render(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        return f"(?:{body})?" if "" in node else body
+
+    return render(trie)
 
 
 class Cleaner:
@@ -65,15 +116,35 @@ class Cleaner:
         )
 
         self.audit_sample_size = max(1, int(self.clean_cfg.get("audit_sample_size", 5)))
+        self.workers = max(1, int(self.clean_cfg.get("workers", 1)))
+        self.parallel_min_segments = max(1, int(self.clean_cfg.get("parallel_min_segments", 400)))
         self._report: Dict[str, Any] = {}
-
-        self._tic_patterns = [self._compile_marker(marker) for marker in self.tic_markers]
-        self._filler_patterns: Dict[str, re.Pattern] = {}
-
-    def _compile_marker(self, marker: str) -> re.Pattern:
-        escaped = re.escape(marker.strip())
-        escaped = re.sub(r"\\\s+", r"\\s+", escaped)
-        return re.compile(rf"(?i)\b{escaped}\b")
+        self._examples: Dict[str, List[Dict[str, Any]]] = {}
+
+        self._tic_alternation = self._compile_markers(self.tic_markers)
+        # one compiled tic+filler pattern (or None) per language, resolved once
+        self._noise_patterns: Dict[str, Optional[re.Pattern]] = {}
+        for language in {*self.clean_fillers, *self.lang_cfg}:
+            self._noise_pattern(language)
+        self._replacement_patterns = self._compile_replacements(self.replacements)
+        self._auto_correction_patterns = self._compile_replacements(self.auto_corrections)
+
+    def _compile_replacements(self, replacements: List[Tuple[str, str]]) -> Optional[Tuple[re.Pattern, List[str]]]:
+        if not replacements:
+            return None
+        # one group per pattern: a single scan, the matched group index picks the replacement;
+        # longest first so a pattern that prefixes a later one cannot shadow it
+        ordered = sorted(replacements, key=lambda pair: len(pair[0]), reverse=True)
+        combined = "|".join(f"({re.escape(pattern)})" for pattern, _ in ordered)
+        return re.compile(combined, re.IGNORECASE), [replacement for _, replacement in ordered]
+
+    def _compile_markers(self, markers: List[str]) -> str:
+        # one alternation (longest marker first) instead of one regex pass per marker
+        bodies = []
+        for marker in sorted(markers, key=len, reverse=True):
+            escaped = re.escape(marker.strip())
+            bodies.append(re.sub(r"\\\s+", r"\\s+", escaped))
+        return "|".join(bodies)
 
     def _init_report(self, total: int) -> None:
         self._report = {
@@ -95,47 +166,55 @@ class Cleaner:
                 "replacements": [],
             },
         }
+        # direct handle on the example buckets: _remember runs inside the per-segment loop
+        self._examples = self._report["examples"]
 
     def _remember(self, bucket: str, payload: Dict[str, Any]) -> None:
-        examples = self._report.setdefault("examples", {}).setdefault(bucket, [])
+        examples = self._examples[bucket]
         if len(examples) < self.audit_sample_size:
             examples.append(payload)
 
-    def _strip_fillers(self, text: str, language: str) -> Tuple[str, int]:
-        if not self.remove_fillers:
-            return text, 0
-        pattern = self._filler_patterns.get(language)
-        fillers = self._get_fillers(language)
-        if fillers and pattern is None:
-            escaped = "|".join(re.escape(f) for f in fillers)
-            pattern = re.compile(rf"\b({escaped})\b", re.IGNORECASE)
-            self._filler_patterns[language] = pattern
+    def _strip_noise(self, text: str, language: str) -> Tuple[str, int, int]:
+        # tic markers and fillers go in one pass; the named group tells which counter to bump
+        pattern = self._noise_pattern(language)
         if not pattern:
-            return text, 0
-        updated, hits = pattern.subn(" ", text)
-        return updated, hits
+            return text, 0, 0
+        hits = {"tic": 0, "filler": 0}
+
+        def drop(match: re.Match) -> str:
+            hits[match.lastgroup] += 1
+            return " "
+
+        updated = pattern.sub(drop, text)
+        return updated, hits["filler"], hits["tic"]
+
+    def _noise_pattern(self, language: str) -> Optional[re.Pattern]:
+        if language in self._noise_patterns:
+            return self._noise_patterns[language]
+        branches = []
+        if self._tic_alternation:
+            branches.append(f"(?P<tic>{self._tic_alternation})")
+        if self.remove_fillers:
+            # shared prefixes are factored so each position tries one branch per character
+            fillers = _trie_alternation([filler.strip() for filler in self._get_fillers(language) if filler])
+            if fillers:
+                branches.append(f"(?P<filler>{fillers})")
+        # nothing to strip: no pattern at all rather than a degenerate \b(?:)\b scan
+        pattern = re.compile(rf"\b(?:{'|'.join(branches)})\b", re.IGNORECASE) if branches else None
+        self._noise_patterns[language] = pattern
+        return pattern
 
     def _get_fillers(self, language: str) -> List[str]:
         if language in self.clean_fillers:
             return self.clean_fillers[language]
         return self.lang_cfg.get(language, {}).get("fillers", [])
 
-    def _remove_tics(self, text: str) -> Tuple[str, int]:
-        if not self._tic_patterns:
-            return text, 0
-        total = 0
-        updated = text
-        for pattern in self._tic_patterns:
-            updated, hits = pattern.subn(" ", updated)
-            total += hits
-        return updated, total
-
     def _dedupe_words(self, text: str) -> str:
-        prev = None
-        current = text
-        while current and current != prev:
-            prev = current
-            current = WORD_REPEAT_PATTERN.sub(r"\1", current)
+        # a collapse can expose a new repeat (e.g. "a a-a a"), so rescan only while the last pass changed something
+        subn = WORD_REPEAT_PATTERN.subn
+        current, hits = subn(r"\1", text)
+        while hits:
+            current, hits = subn(r"\1", current)
         return current
 
     def _sanitize_text(self, text: str, language: str) -> Tuple[str, int, int, int]:
@@ -145,35 +224,30 @@ class Cleaner:
         replacement_hits = 0
         if not cleaned:
             return "", filler_hits, tic_hits, replacement_hits
-        cleaned, tic_hits = self._remove_tics(cleaned)
-        cleaned, filler_hits = self._strip_fillers(cleaned, language)
-        cleaned, fix_hits = self._apply_replacements(cleaned, self.replacements)
-        cleaned, auto_hits = self._apply_replacements(cleaned, self.auto_corrections)
+        cleaned, filler_hits, tic_hits = self._strip_noise(cleaned, language)
+        cleaned, fix_hits = self._apply_replacements(cleaned, self._replacement_patterns)
+        cleaned, auto_hits = self._apply_replacements(cleaned, self._auto_correction_patterns)
         replacement_hits = fix_hits + auto_hits
         cleaned = self._dedupe_words(cleaned)
-        cleaned = re.sub(r"\s{2,}", " ", cleaned)
+        cleaned = " ".join(cleaned.split())
+        # substring checks skip regex passes whose anchor character is absent (the common case)
         if self.normalize_apostrophes:
-            cleaned = cleaned.replace("’", "'").replace("`", "'")
-            cleaned = re.sub(r"\s+'", " '", cleaned)
-            cleaned = re.sub(r"'\s+", "'", cleaned)
-        cleaned = re.sub(r"\s+([,;:.!?])", r"\1", cleaned)
-        cleaned = re.sub(r"\s+([»])", r"\1", cleaned)
-        cleaned = re.sub(r"([«])\s+", r"\1", cleaned)
+            cleaned = cleaned.translate(APOSTROPHE_TRANSLATION)
+            if "'" in cleaned:
+                cleaned = APOSTROPHE_SPACING_PATTERN.sub(_apostrophe_spacing, cleaned)
+        if any(anchor in cleaned for anchor in PUNCT_SPACING_ANCHORS):
+            cleaned = PUNCT_SPACING_PATTERN.sub(r"\1\2", cleaned)
+        # after the split/join collapse the only boundary whitespace left is " ", so this is the last trim needed
         cleaned = cleaned.strip(" -")
         if self.capitalize_start and cleaned:
             cleaned = cleaned[0].upper() + cleaned[1:]
-        return cleaned.strip(), filler_hits, tic_hits, replacement_hits
+        return cleaned, filler_hits, tic_hits, replacement_hits
 
-    def _apply_replacements(self, text: str, replacements: List[Tuple[str, str]]) -> Tuple[str, int]:
+    def _apply_replacements(self, text: str, replacements: Optional[Tuple[re.Pattern, List[str]]]) -> Tuple[str, int]:
         if not replacements or not text:
             return text, 0
-        total = 0
-        updated = text
-        for pattern, replacement in replacements:
-            regex = re.compile(re.escape(pattern), re.IGNORECASE)
-            updated, hits = regex.subn(replacement, updated)
-            total += hits
-        return updated, total
+        regex, targets = replacements
+        return regex.subn(lambda match: targets[match.lastindex - 1], text)
 
     def run(self, segments: List[Dict], language: str) -> List[Dict]:
         if not segments:
@@ -188,11 +262,20 @@ class Cleaner:
         buffer_seg = None
         redundancy_buffer: Deque[Dict[str, Any]] = deque(maxlen=self.redundancy_window)
 
-        for seg in segments:
+        for seg, prepared in zip(segments, self._prepare_segments(segments, language)):
+            (
+                words,
+                low_conf_words,
+                word_scores,
+                text,
+                filler_hits,
+                tic_hits,
+                replacement_hits,
+                text_human,
+                text_machine,
+                normalized_for_similarity,
+            ) = prepared
             raw_words = seg.get("words") or []
-            low_conf_words = self._collect_low_conf_words(raw_words, self.confidence_word_threshold)
-            words = self._filtered_words(raw_words)
-            text, filler_hits, tic_hits, replacement_hits = self._sanitize_text(seg.get("text", ""), language)
             if filler_hits:
                 self._report["fillers_removed"] += filler_hits
             if tic_hits:
@@ -205,18 +288,15 @@ class Cleaner:
                 self._remember("dropped", {"start": seg.get("start"), "reason": "empty"})
                 continue
             lang_code = language or "fr"
-            text_human, text_machine = self.normalizer.normalize_pair(text, lang_code)
             text = text_human
 
-            normalized_for_similarity = self._normalize_for_similarity(text)
             if self._is_redundant(normalized_for_similarity, redundancy_buffer, seg["start"], seg["end"]):
                 self._report["redundant_segments"] += 1
                 self._remember("redundant", {"start": seg.get("start"), "text": text[:80]})
                 continue
 
+            # maxlen evicts the oldest entry
             redundancy_buffer.append({"text": normalized_for_similarity, "start": seg.get("start"), "end": seg.get("end")})
-            if len(redundancy_buffer) > self.redundancy_window:
-                redundancy_buffer.popleft()
 
             candidate = {
                 "start": seg["start"],
@@ -232,7 +312,7 @@ class Cleaner:
             if low_conf_words:
                 candidate.setdefault("annotations", {})["low_conf_words"] = low_conf_words
 
-            confidence = self._segment_confidence(words, seg)
+            confidence = self._segment_confidence(word_scores, seg)
             if confidence is not None:
                 candidate["confidence"] = round(confidence, 3)
             if self.glossary:
@@ -259,14 +339,16 @@ class Cleaner:
                 if seg_duration < min_duration and gap <= max_gap:
                     buffer_seg["end"] = seg["end"]
                     buffer_seg.setdefault("text_fragments", []).append(text)
-                    buffer_seg["text"] = join_text(buffer_seg["text_fragments"])
                     buffer_seg.setdefault("words", []).extend(words)
-                    self._refresh_dual_text(buffer_seg)
                     self._report["short_merges"] += 1
                     continue
             buffer_seg = candidate
             cleaned.append(buffer_seg)
 
+        # texts are rebuilt from the fragments, so merged segments are normalised once, not per absorbed fragment
+        for seg in cleaned:
+            if len(seg["text_fragments"]) > 1:
+                self._refresh_dual_text(seg)
         merged = self._merge_short_segments(cleaned)
         for seg in merged:
             seg.pop("text_fragments", None)
@@ -275,36 +357,87 @@ class Cleaner:
             self._report["glossary"] = self.glossary.snapshot()
         return merged
 
-    def _collect_low_conf_words(self, words: List[Dict], threshold: Optional[float]) -> List[Dict[str, Any]]:
-        if threshold is None:
-            return []
+    def _prepare_segments(self, segments: List[Dict], language: str) -> Iterable[Tuple[Any, ...]]:
+        # per-segment work is independent; the redundancy window, merges and report stay sequential in run()
+        if self.workers <= 1 or len(segments) < self.parallel_min_segments:
+            return (self._prepare_segment(seg, language) for seg in segments)
+        workers = min(self.workers, os.cpu_count() or 1)
+        self.logger.info(
+            "Nettoyage parallèle: segments=%d, workers=%d, chunksize=%d", len(segments), workers, PARALLEL_CHUNKSIZE
+        )
+        # workers get a copy without the logger, glossary or report: they only run the pure per-segment steps
+        worker_cleaner = copy.copy(self)
+        worker_cleaner.logger = None
+        worker_cleaner.glossary = None
+        worker_cleaner._report = {}
+        worker_cleaner._examples = {}
+        try:
+            with ProcessPoolExecutor(
+                max_workers=workers, initializer=_init_clean_worker, initargs=(worker_cleaner,)
+            ) as executor:
+                return list(
+                    executor.map(_prepare_in_worker, segments, repeat(language), chunksize=PARALLEL_CHUNKSIZE)
+                )
+        except Exception as exc:
+            # broken pools, but also pickling failures (PicklingError, AttributeError, TypeError) on the payloads
+            self.logger.warning("Nettoyage parallèle indisponible (%s: %s), repli séquentiel", type(exc).__name__, exc)
+            return [self._prepare_segment(seg, language) for seg in segments]
+
+    def _prepare_segment(self, seg: Dict, language: str) -> Tuple[Any, ...]:
+        words, low_conf_words, word_scores = self._scan_words(seg.get("words") or [])
+        text, filler_hits, tic_hits, replacement_hits = self._sanitize_text(seg.get("text", ""), language)
+        text_human = text_machine = normalized_for_similarity = ""
+        if text:
+            text_human, text_machine = self.normalizer.normalize_pair(text, language or "fr")
+            normalized_for_similarity = self._normalize_for_similarity(text_human)
+        return (
+            words,
+            low_conf_words,
+            word_scores,
+            text,
+            filler_hits,
+            tic_hits,
+            replacement_hits,
+            text_human,
+            text_machine,
+            normalized_for_similarity,
+        )
+
+    def _scan_words(self, words: List[Dict]) -> Tuple[List[Dict], List[Dict[str, Any]], List[float]]:
+        # one pass over the ASR words: kept words, low-confidence samples and the scores of kept words.
+        # Kept word dicts are the aligner's own objects: nothing after cleaning mutates a word in place.
+        low_threshold = self.confidence_word_threshold
+        keep_threshold = float(self.min_word_confidence) if self.min_word_confidence is not None else None
+        sample_size = self.audit_sample_size
+        kept: List[Dict] = []
         flagged: List[Dict[str, Any]] = []
-        for word in words:
-            probability = word.get("probability")
-            try:
-                score = float(probability)
-            except (TypeError, ValueError):
-                continue
-            if score >= threshold:
-                continue
-            flagged.append(
-                {
-                    "word": (word.get("word") or word.get("text") or "").strip(),
-                    "score": round(score, 3),
-                    "start": word.get("start"),
-                    "end": word.get("end"),
-                }
-            )
-        return flagged[: self.audit_sample_size]
-
-    def _segment_confidence(self, words: List[Dict], original_seg: Dict) -> Optional[float]:
         scores: List[float] = []
         for word in words:
             probability = word.get("probability")
             try:
-                scores.append(float(probability))
+                score: Optional[float] = float(probability)
             except (TypeError, ValueError):
+                score = None
+            # `not >=` rather than `<` so NaN scores are treated as below threshold, as before
+            low = low_threshold is not None and score is not None and not score >= low_threshold
+            if low and len(flagged) < sample_size:
+                flagged.append(
+                    {
+                        "word": (word.get("word") or word.get("text") or "").strip(),
+                        "score": round(score, 3),
+                        "start": word.get("start"),
+                        "end": word.get("end"),
+                    }
+                )
+            # missing, null or unparsable probabilities never drop a word
+            if keep_threshold is not None and score is not None and not score >= keep_threshold:
                 continue
+            kept.append(word)
+            if score is not None:
+                scores.append(score)
+        return kept, flagged, scores
+
+    def _segment_confidence(self, scores: List[float], original_seg: Dict) -> Optional[float]:
         if scores:
             return sum(scores) / len(scores)
         confidence = original_seg.get("confidence")
@@ -321,40 +454,42 @@ class Cleaner:
                 return None
         return None
 
-    def _filtered_words(self, words: List[Dict]) -> List[Dict]:
-        if self.min_word_confidence is None:
-            return [dict(word) for word in words]
-        threshold = float(self.min_word_confidence)
-        filtered = []
-        for word in words:
-            prob = word.get("probability", 1.0)
-            try:
-                keep = prob is None or float(prob) >= threshold
-            except (TypeError, ValueError):
-                keep = True
-            if keep:
-                filtered.append(dict(word))
-        return filtered
-
     def _merge_short_segments(self, segments: List[Dict]) -> List[Dict]:
         if not self.merge_short_enabled or not segments:
             return segments
+        max_gap = self.merge_short_max_gap
+        max_duration = self.merge_short_max_duration
         merged: List[Dict] = []
+        absorbing: List[Dict] = []
+        merges = 0
+        # merged[-1] always ends where the previous input segment ends and shares its speaker,
+        # so each decision only needs the previous segment's end and speaker, kept in locals
+        previous_end: Optional[float] = None
+        previous_speaker = None
         for seg in segments:
+            start = seg["start"]
+            end = seg["end"]
+            speaker = seg.get("speaker")
             if (
-                merged
-                and seg.get("speaker") == merged[-1].get("speaker")
-                and (seg["start"] - merged[-1]["end"]) <= self.merge_short_max_gap
-                and (seg["end"] - seg["start"]) <= self.merge_short_max_duration
+                previous_end is not None
+                and speaker == previous_speaker
+                and (start - previous_end) <= max_gap
+                and (end - start) <= max_duration
             ):
-                merged[-1]["end"] = seg["end"]
-                merged[-1].setdefault("text_fragments", []).extend(seg.get("text_fragments", [seg.get("text")]))
-                merged[-1]["text"] = join_text(merged[-1]["text_fragments"])
-                merged[-1].setdefault("words", []).extend(seg.get("words", []))
-                self._report["short_merges"] += 1
-                self._refresh_dual_text(merged[-1])
+                target = merged[-1]
+                target["end"] = end
+                target.setdefault("text_fragments", []).extend(seg.get("text_fragments", [seg.get("text")]))
+                target.setdefault("words", []).extend(seg.get("words", []))
+                merges += 1
+                if not absorbing or absorbing[-1] is not target:
+                    absorbing.append(target)
             else:
                 merged.append(seg)
+            previous_end = end
+            previous_speaker = speaker
+        self._report["short_merges"] += merges
+        for seg in absorbing:
+            self._refresh_dual_text(seg)
         return merged
 
     def _refresh_dual_text(self, segment: Dict) -> None:
@@ -369,9 +504,8 @@ class Cleaner:
 
     def _normalize_for_similarity(self, text: str) -> str:
         normalized = text.lower()
-        normalized = re.sub(r"[^a-z0-9à-öø-ÿ\s]", "", normalized)
-        normalized = re.sub(r"\s+", " ", normalized)
-        return normalized.strip()
+        normalized = SIMILARITY_STRIP_PATTERN.sub("", normalized)
+        return " ".join(normalized.split())
 
     def _is_redundant(self, text: str, buffer: Deque[Dict[str, Any]], start: float, end: float) -> bool:
         if not self.redundancy_enabled or len(text) < self.redundancy_min_chars:
@@ -380,9 +514,19 @@ class Cleaner:
         for phrase in self.redundancy_whitelist:
             if phrase and phrase in lowered:
                 return False
+        threshold = self.redundancy_similarity
         for previous in buffer:
-            score = SequenceMatcher(None, text, previous["text"]).ratio()
-            if score >= self.redundancy_similarity:
+            # the b-side index of each buffered text is built once and reused across the window
+            matcher = previous.get("matcher")
+            if matcher is None:
+                matcher = previous["matcher"] = SequenceMatcher(None, "", previous["text"], autojunk=False)
+            matcher.set_seq1(text)
+            # cheap upper bounds first: most candidates are rejected without the full ratio()
+            if (
+                matcher.real_quick_ratio() >= threshold
+                and matcher.quick_ratio() >= threshold
+                and matcher.ratio() >= threshold
+            ):
                 gap = start - previous.get("end", start)
                 if gap <= self.redundancy_max_gap:
                     return True
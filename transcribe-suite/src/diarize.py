@@ -19,6 +19,9 @@ except ImportError:  # pragma: no cover
     torch = None
 
 
+URI_WHITESPACE_PATTERN = re.compile(r"\s+")
+URI_UNSAFE_PATTERN = re.compile(r"[^\w.\-]+")
+
 SAFE_GLOBALS = []
 
 try:
@@ -172,8 +175,8 @@ class Diarizer:
 
     def _safe_uri(self, stem: str) -> str:
         """Pyannote RTTM writer rejects URIs with spaces => sanitize."""
-        clean = re.sub(r"\s+", "_", stem.strip())
-        clean = re.sub(r"[^\w.\-]+", "_", clean)
+        clean = URI_WHITESPACE_PATTERN.sub("_", stem.strip())
+        clean = URI_UNSAFE_PATTERN.sub("_", clean)
         return clean or "audio"
 
     def _stabilize_segments(self, segments: List[Dict]) -> List[Dict]:
@@ -192,7 +195,8 @@ class Diarizer:
         min_turn = float(self.cfg.get("min_speaker_turn", 1.2))
         if min_turn <= 0:
             return ordered
-        stabilized: List[Dict] = [dict(ordered[0])]
+        # run() builds these dicts fresh from the pyannote turns, so they are extended in place rather than copied
+        stabilized: List[Dict] = [ordered[0]]
         for seg in ordered[1:]:
             last = stabilized[-1]
             if seg.get("speaker") == last.get("speaker"):
@@ -202,25 +206,23 @@ class Diarizer:
             if duration < min_turn:
                 last["end"] = max(last["end"], seg["end"])
                 continue
-            stabilized.append(dict(seg))
+            stabilized.append(seg)
         return stabilized
 
     def _limit_speakers(self, segments: List[Dict], max_speakers: int) -> List[Dict]:
         if not segments or max_speakers <= 0:
             return segments
         template = "SPEAKER_{:02d}"
+        overflow = template.format(max_speakers - 1)
         speaker_map: Dict[str, str] = {}
         for seg in segments:
             speaker = seg.get("speaker") or "unknown"
-            if speaker in speaker_map:
-                seg["speaker"] = speaker_map[speaker]
-                continue
-            if len(speaker_map) < max_speakers:
-                label = template.format(len(speaker_map))
+            label = speaker_map.get(speaker)
+            if label is None:
+                # speakers past the limit are folded into the last label, and remembered like the others
+                label = template.format(len(speaker_map)) if len(speaker_map) < max_speakers else overflow
                 speaker_map[speaker] = label
-                seg["speaker"] = label
-            else:
-                seg["speaker"] = template.format(max_speakers - 1)
+            seg["speaker"] = label
         return segments
 
     def _apply_speech_mask(self, segments: List[Dict], speech_segments: List[Dict]) -> List[Dict]:
@@ -13,7 +13,7 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
 from audit import AuditReporter
-from align import Aligner
+from align import Aligner, load_aligned_payload
 from asr import ASRProcessor
 from clean import Cleaner
 from chunker import Chunker
@@ -513,7 +513,8 @@ class PipelineRunner:
         audio_path = self.ensure_audio_ready()
         target_language = self.asr_info.get("language") if self.asr_info else self.requested_lang
         language = target_language if target_language not in (None, "", "auto") else self.preferred_align_lang
-        self.aligner.prewarm(language)
+        if merged["segments"]:
+            self.aligner.prewarm(language)
         asr_like = {"language": language, "segments": merged["segments"]}
         with stage_timer(self.logger, "Alignement WhisperX"):
             self.align_info = self.aligner.run(
@@ -655,7 +656,7 @@ class PipelineRunner:
         aligned_path = self.work_dir / "03_aligned_whisperx.json"
         if not aligned_path.exists():
             raise PipelineError("Alignement introuvable. Lance la commande 'align'.")
-        payload = read_json(aligned_path)
+        payload = load_aligned_payload(aligned_path, logger=self.logger)
         self.align_info = {
             "segments": payload.get("segments", []),
             "language": payload.get("language", self.requested_lang),
@@ -1353,6 +1354,8 @@ def main():
         raise
     else:
         runner.finalize_run(success=True, error=None)
+    finally:
+        runner.asr.close()
 
 
 if __name__ == "__main__":
@@ -13,6 +13,7 @@ class Segmenter:
         self.cfg = config.get("segmenter", {})
         self.segment_length = float(self.cfg.get("segment_length", 75.0))
         self.overlap = float(self.cfg.get("overlap", 8.0))
+        self.min_tail = float(self.cfg.get("min_tail", 10.0))
         self.sample_rate = int(self.cfg.get("sample_rate", 16000))
         self.channels = int(self.cfg.get("channels", 1))
         self.manifest_name = self.cfg.get("manifest_name", "manifest.csv")
@@ -45,6 +46,7 @@ class Segmenter:
         segment_length_ms = int(round(self.segment_length * 1000))
         overlap_ms = int(round(self.overlap * 1000))
         hop_ms = max(segment_length_ms - overlap_ms, 1)
+        min_tail_ms = int(round(self.min_tail * 1000))
         total_ms = int(round(duration * 1000))
 
         records: List[Dict[str, str]] = []
@@ -52,6 +54,9 @@ class Segmenter:
         start_ms = 0
         while start_ms < total_ms:
             end_ms = min(start_ms + segment_length_ms, total_ms)
+            if total_ms - end_ms < min_tail_ms:
+                # a short tail would cost a full (padded) encoder pass: absorb it in this window
+                end_ms = total_ms
             seg_name = f"seg_{idx:05d}__from_{start_ms}__to_{end_ms}.wav"
             seg_path = segments_dir / seg_name
             self._slice_audio(audio_path, seg_path, start_ms, end_ms)
@@ -66,6 +71,8 @@ class Segmenter:
                 }
             )
             idx += 1
+            if end_ms >= total_ms:
+                break
             start_ms += hop_ms
 
         self._write_manifest(manifest_path, records)
@@ -2,6 +2,7 @@ import hashlib
 import io
 import json
 import logging
+import math
 import os
 import platform
 import re
@@ -10,12 +11,18 @@ import subprocess
 import sys
 import unicodedata
 from contextlib import contextmanager
+from json.encoder import encode_basestring_ascii
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 import yaml
 import hashlib
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
 TS_SRC_DIR = Path(__file__).resolve()
 TS_ROOT = TS_SRC_DIR.parents[1]
 REPO_ROOT = TS_ROOT.parent
@@ -24,6 +31,7 @@ LOCAL_DATA_ENV_VAR = "TS_ALLOW_LOCAL_DATA"
 
 THREAD_VARS = ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "VECLIB_MAXIMUM_THREADS", "NUMEXPR_NUM_THREADS")
 _UTF8_CONSOLE_STREAM = None
+_TORCH_THREADS_APPLIED: Optional[tuple] = None
 
 
 class PipelineError(RuntimeError):
@@ -44,16 +52,22 @@ def apply_thread_env(label: str, threads: int) -> None:
 
 
 def configure_torch_threads(num_threads: int, interop_threads: int = 2) -> None:
+    global _TORCH_THREADS_APPLIED
+    budget = (max(1, int(num_threads)), max(1, int(interop_threads)))
+    if budget == _TORCH_THREADS_APPLIED:
+        # resizing the OpenMP/MKL pools tears them down; skip when nothing changed
+        return
     try:
         import torch  # type: ignore
     except ImportError:
         return
+    _TORCH_THREADS_APPLIED = budget
     try:
-        torch.set_num_threads(max(1, int(num_threads)))
+        torch.set_num_threads(budget[0])
     except Exception:
         pass
     try:
-        torch.set_num_interop_threads(max(1, int(interop_threads)))
+        torch.set_num_interop_threads(budget[1])
     except Exception:
         pass
 
@@ -294,6 +308,33 @@ def write_json(path: Path, payload: Any, indent: int = 2, sort_keys: bool = Fals
         f.write("\n")
 
 
+def write_json_fast(path: Path, payload: Any) -> None:
+    """Same layout as write_json (indent 2, UTF-8), serialized with orjson when available."""
+    if orjson is None:
+        write_json(path, payload)
+        return
+    try:
+        data = orjson.dumps(
+            payload,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_APPEND_NEWLINE,
+        )
+    except (orjson.JSONEncodeError, TypeError):
+        write_json(path, payload)
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+
+
+def dumps_json_line(payload: Any) -> bytes:
+    """Compact UTF-8 JSON followed by a newline, for JSONL outputs."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+        except (orjson.JSONEncodeError, TypeError):
+            pass
+    return (json.dumps(payload, ensure_ascii=False) + "\n").encode("utf-8")
+
+
 def read_json(path: Path) -> Any:
     with path.open("r", encoding="utf-8") as f:
         return json.load(f)
@@ -365,11 +406,13 @@ def normalize_media_path(raw: Optional[Any]) -> Optional[str]:
 
 def stable_id(source_path: str, ts_start: float, ts_end: float, speaker: Optional[str] = None) -> str:
     """Generate a deterministic identifier for artifacts."""
-    payload = {
-        "src": source_path,
-        "t0": round(float(ts_start or 0.0), 3),
-        "t1": round(float(ts_end or ts_start or 0.0), 3),
-        "spk": speaker or "",
-    }
-    digest_input = json.dumps(payload, sort_keys=True, separators=(",", ":")).encode("utf-8")
-    return hashlib.sha1(digest_input).hexdigest()[:12]
+    t0 = round(float(ts_start or 0.0), 3)
+    t1 = round(float(ts_end or ts_start or 0.0), 3)
+    spk = speaker or ""
+    if isinstance(source_path, str) and isinstance(spk, str) and math.isfinite(t0) and math.isfinite(t1):
+        # same bytes as the sorted compact json.dumps below, without going through the generic encoder
+        digest_text = f'{{"spk":{encode_basestring_ascii(spk)},"src":{encode_basestring_ascii(source_path)},"t0":{t0!r},"t1":{t1!r}}}'
+    else:
+        payload = {"src": source_path, "t0": t0, "t1": t1, "spk": spk}
+        digest_text = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(digest_text.encode("utf-8")).hexdigest()[:12]
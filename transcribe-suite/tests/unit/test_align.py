@@ -0,0 +1,293 @@
+import logging
+import os
+import time
+
+from align import Aligner, load_aligned_payload, save_aligned_payload
+
+
+def _aligner(**align_cfg) -> Aligner:
+    return Aligner({"align": {"device": "cpu", **align_cfg}}, logging.getLogger("test_align"))
+
+
+def test_assign_speakers_uses_containing_window():
+    aligner = _aligner()
+    diar_segments = [
+        {"start": 0.0, "end": 2.0, "speaker": "SPEAKER_00"},
+        {"start": 2.0, "end": 5.0, "speaker": "SPEAKER_01"},
+        {"start": 6.0, "end": 8.0, "speaker": "SPEAKER_00"},
+    ]
+    segments = [
+        {
+            "start": 0.5,
+            "end": 1.5,
+            "words": [{"start": 0.5, "end": 0.9}, {"start": 2.5, "end": 2.9}],
+        },
+        {"start": 6.5, "end": 7.5, "words": []},
+        {"start": 5.2, "end": 5.6, "words": []},
+    ]
+    aligner._assign_speakers(segments, diar_segments)
+    assert segments[0]["speaker"] == "SPEAKER_00"
+    assert [word["speaker"] for word in segments[0]["words"]] == ["SPEAKER_00", "SPEAKER_01"]
+    assert segments[1]["speaker"] == "SPEAKER_00"
+    # gap between windows falls back to the last diarized speaker
+    assert segments[2]["speaker"] == "SPEAKER_00"
+
+
+def test_assign_speakers_handles_nested_windows():
+    aligner = _aligner()
+    diar_segments = [
+        {"start": 0.0, "end": 10.0, "speaker": "SPEAKER_00"},
+        {"start": 2.0, "end": 3.0, "speaker": "SPEAKER_01"},
+    ]
+    segments = [{"start": 4.0, "end": 5.0, "words": []}]
+    aligner._assign_speakers(segments, diar_segments)
+    assert segments[0]["speaker"] == "SPEAKER_00"
+
+
+def test_assign_speakers_overlap_keeps_first_listed_turn():
+    aligner = _aligner()
+    diar_segments = [
+        {"start": 3.0, "end": 6.0, "speaker": "SPEAKER_01"},
+        {"start": 0.0, "end": 5.0, "speaker": "SPEAKER_00"},
+        {"start": 4.0, "end": 4.8, "speaker": "SPEAKER_02"},
+    ]
+    segments = [{"start": 4.0, "end": 4.4, "words": [{"start": 2.0, "end": 2.2}]}]
+    aligner._assign_speakers(segments, diar_segments)
+    assert segments[0]["speaker"] == "SPEAKER_01"
+    assert segments[0]["words"][0]["speaker"] == "SPEAKER_00"
+
+
+def test_filter_speech_segments_keeps_midpoints_inside_windows():
+    aligner = _aligner(speech_only=True)
+    diar_segments = [
+        {"start": 5.0, "end": 6.0, "speaker": "SPEAKER_01"},
+        {"start": 0.0, "end": 4.0, "speaker": "SPEAKER_00"},
+        {"start": 1.0, "end": 1.5, "speaker": "SPEAKER_01"},
+    ]
+    segments = [
+        {"start": 0.0, "end": 1.0, "text": "a"},
+        {"start": 4.2, "end": 4.8, "text": "b"},
+        {"start": 4.0, "end": 4.08, "text": "c"},
+        {"start": 5.5, "end": 5.9, "text": "d"},
+        {"start": 7.0, "end": 8.0, "text": "e"},
+    ]
+    kept = aligner._filter_speech_segments(segments, diar_segments)
+    assert [seg["text"] for seg in kept] == ["a", "c", "d"]
+
+
+def _fake_sentence_align(calls, drop_last_word=False):
+    def fake_align(segments, model, metadata, audio, **kwargs):
+        calls.append([dict(seg) for seg in segments])
+        aligned = []
+        for seg in segments:
+            tokens = seg["text"].split()
+            step = (seg["end"] - seg["start"]) / len(tokens)
+            words = [
+                {"word": token, "start": seg["start"] + i * step, "end": seg["start"] + (i + 1) * step}
+                for i, token in enumerate(tokens)
+            ]
+            if drop_last_word and len(segments) < 3:
+                words = words[:-1]
+            # WhisperX splits every input segment into sentence sub-segments
+            sentence = []
+            for word in words:
+                sentence.append(word)
+                if word["word"].endswith(".") or word is words[-1]:
+                    aligned.append(
+                        {
+                            "start": sentence[0]["start"],
+                            "end": sentence[-1]["end"],
+                            "text": " ".join(item["word"] for item in sentence),
+                            "words": sentence,
+                        }
+                    )
+                    sentence = []
+        return {"segments": aligned}
+
+    return fake_align
+
+
+def test_invoke_align_packs_segments_and_restores_boundaries():
+    aligner = _aligner(pack_max_duration=10.0)
+    calls = []
+    aligner._align_callable = _fake_sentence_align(calls)
+    segments = [
+        {"start": 0.0, "end": 3.0, "text": "bonjour. à tous"},
+        {"start": 3.2, "end": 4.0, "text": "merci"},
+        {"start": 12.0, "end": 14.0, "text": "au revoir"},
+    ]
+    result = aligner._invoke_align(segments, None, None, "audio.wav", {})
+    assert len(calls) == 1
+    assert [seg["text"] for seg in calls[0]] == ["bonjour. à tous merci", "au revoir"]
+    # sentence sub-segments survive; the one straddling two ASR segments is split on word times
+    assert [seg["text"] for seg in result["segments"]] == ["bonjour.", "à tous", "merci", "au revoir"]
+    assert [len(seg["words"]) for seg in result["segments"]] == [1, 2, 1, 2]
+    assert result["segments"][2]["start"] == 3.0
+
+
+def test_invoke_align_realigns_unpacked_on_mismatch():
+    aligner = _aligner(pack_max_duration=10.0)
+    calls = []
+    aligner._align_callable = _fake_sentence_align(calls, drop_last_word=True)
+    segments = [
+        {"start": 0.0, "end": 2.0, "text": "bonjour à tous"},
+        {"start": 2.0, "end": 4.0, "text": "merci"},
+        {"start": 5.0, "end": 6.0, "text": "au revoir"},
+    ]
+    result = aligner._invoke_align(segments, None, None, "audio.wav", {})
+    assert [len(call) for call in calls] == [1, 3]
+    assert [seg["text"] for seg in calls[1]] == ["bonjour à tous", "merci", "au revoir"]
+    assert [seg["text"] for seg in result["segments"]] == ["bonjour à tous", "merci", "au revoir"]
+
+
+def test_invoke_align_skips_packing_for_unspaced_languages():
+    aligner = _aligner(pack_max_duration=10.0)
+    calls = []
+    aligner._align_callable = _fake_sentence_align(calls)
+    segments = [{"start": 0.0, "end": 1.0, "text": "こんにちは"}, {"start": 1.0, "end": 2.0, "text": "世界"}]
+    result = aligner._invoke_align(segments, None, {"language": "ja"}, "audio.wav", {})
+    assert [len(call) for call in calls] == [2]
+    assert [seg["text"] for seg in result["segments"]] == ["こんにちは", "世界"]
+
+
+def test_invoke_align_shards_segments_on_cuda():
+    aligner = _aligner(workers=4, cuda_shards=2)
+    aligner.device = "cuda"
+    seen = []
+
+    def fake_align(segments, model, metadata, audio, **kwargs):
+        seen.append(len(segments))
+        return {
+            "segments": [dict(seg, words=[]) for seg in segments],
+            "word_segments": [],
+        }
+
+    aligner._align_callable = fake_align
+    segments = [{"start": float(idx), "end": idx + 0.5, "text": f"mot{idx}"} for idx in range(5)]
+    result = aligner._invoke_align(segments, None, None, "audio.wav", {})
+    assert sorted(seen) == [2, 3]
+    assert [seg["text"] for seg in result["segments"]] == [seg["text"] for seg in segments]
+
+
+def test_invoke_align_cuda_sharding_is_opt_in_and_capped():
+    assert _aligner(workers=4).cuda_shards == 1
+    assert _aligner(workers=4, cuda_shards=8).cuda_shards == 2
+    aligner = _aligner(workers=4)
+    aligner.device = "cuda"
+    segments = [{"start": float(idx), "end": idx + 0.5, "text": f"mot{idx}"} for idx in range(5)]
+    assert aligner._align_shards(segments) == [segments]
+
+
+def test_invoke_align_falls_back_to_serial_on_cuda_oom():
+    aligner = _aligner(workers=2, cuda_shards=2)
+    aligner.device = "cuda"
+    seen = []
+
+    def fake_align(segments, model, metadata, audio, **kwargs):
+        seen.append(len(segments))
+        if len(segments) < 5:
+            raise RuntimeError("CUDA out of memory. Tried to allocate 2.00 GiB")
+        return {"segments": [dict(seg, words=[]) for seg in segments], "word_segments": []}
+
+    aligner._align_callable = fake_align
+    segments = [{"start": float(idx), "end": idx + 0.5, "text": f"mot{idx}"} for idx in range(5)]
+    result = aligner._invoke_align(segments, None, None, "audio.wav", {})
+    assert sorted(seen[:2]) == [2, 3] and seen[2:] == [5]
+    assert [seg["text"] for seg in result["segments"]] == [seg["text"] for seg in segments]
+    assert aligner.cuda_shards == 1
+
+
+def test_finalize_segments_sanitizes_and_assigns_speakers():
+    aligner = _aligner()
+    diar_segments = [{"start": 0.0, "end": 3.0, "speaker": "SPEAKER_00"}]
+    segments = [
+        {
+            "start": 0.0,
+            "end": 1.0,
+            "text": "  bonjour  tout   le monde ",
+            "words": [{"word": " bonjour ", "start": 0.0, "end": 0.4}],
+        }
+    ]
+    aligner._finalize_segments(segments, diar_segments)
+    assert segments[0]["text"] == "bonjour tout le monde"
+    assert segments[0]["speaker"] == "SPEAKER_00"
+    assert segments[0]["words"][0] == {"word": "bonjour", "start": 0.0, "end": 0.4, "speaker": "SPEAKER_00"}
+
+
+def test_run_without_segments_skips_model_load(tmp_path, monkeypatch):
+    aligner = _aligner()
+
+    def fail_load(language):
+        raise AssertionError("align model should not be loaded")
+
+    monkeypatch.setattr(aligner, "_load_align_model", fail_load)
+    result = aligner.run(tmp_path / "audio.wav", {"language": "fr", "segments": []}, {}, tmp_path)
+    assert result["segments"] == []
+    assert result["align_status"] == "ok"
+    assert (tmp_path / "03_aligned_whisperx.json").exists()
+
+
+def test_assign_speakers_single_speaker_shortcut():
+    aligner = _aligner()
+    diar_segments = [
+        {"start": 0.0, "end": 1.0, "speaker": "SPEAKER_00"},
+        {"start": 3.0, "end": 4.0, "speaker": "SPEAKER_00"},
+    ]
+    segments = [{"start": 10.0, "end": 11.0, "words": [{"word": "x"}]}]
+    aligner._assign_speakers(segments, diar_segments)
+    assert segments[0]["speaker"] == "SPEAKER_00"
+    assert segments[0]["words"][0]["speaker"] == "SPEAKER_00"
+
+
+def test_run_many_preserves_job_order(tmp_path, monkeypatch):
+    aligner = _aligner()
+    prewarmed = []
+    monkeypatch.setattr(aligner, "prewarm", prewarmed.append)
+    jobs = []
+    for idx, language in enumerate(["fr", "en", "fr"]):
+        work_dir = tmp_path / f"doc{idx}"
+        jobs.append((work_dir / "audio.wav", {"language": language, "segments": []}, {}, work_dir, False))
+    results = aligner.run_many(jobs)
+    assert [result["language"] for result in results] == ["fr", "en", "fr"]
+    assert [result["path"].parent.name for result in results] == ["doc0", "doc1", "doc2"]
+    assert prewarmed == []
+
+
+def test_aligned_payload_prefers_fresh_pickle(tmp_path):
+    aligned_path = tmp_path / "03_aligned_whisperx.json"
+    save_aligned_payload(aligned_path, {"segments": [{"text": "a"}], "language": "fr"})
+    assert aligned_path.with_suffix(".pkl").exists()
+    assert load_aligned_payload(aligned_path)["segments"] == [{"text": "a"}]
+    aligned_path.write_text('{"segments": [], "language": "fr"}', encoding="utf-8")
+    os.utime(aligned_path, (time.time() + 5, time.time() + 5))
+    assert load_aligned_payload(aligned_path)["segments"] == []
+
+
+def test_aligned_payload_falls_back_to_json_on_corrupt_pickle(tmp_path, caplog):
+    aligned_path = tmp_path / "03_aligned_whisperx.json"
+    save_aligned_payload(aligned_path, {"segments": [{"text": "a"}], "language": "fr"})
+    pkl_path = aligned_path.with_suffix(".pkl")
+    pkl_path.write_bytes(pkl_path.read_bytes()[:-3])
+    assert load_aligned_payload(aligned_path)["segments"] == [{"text": "a"}]
+    # a pickle pointing at a class that no longer exists raises AttributeError, not UnpicklingError
+    pkl_path.write_bytes(b"calign\nGone\n.")
+    with caplog.at_level(logging.WARNING):
+        assert load_aligned_payload(aligned_path, logger=logging.getLogger("test_align"))["language"] == "fr"
+    assert "AttributeError" in caplog.text
+
+
+def test_align_signature_cache_can_be_disabled(tmp_path, monkeypatch):
+    import types
+
+    import align
+
+    def fake_align(segments, model, metadata, audio, device="cpu"):
+        return {}
+
+    monkeypatch.setattr(align, "whisperx", types.SimpleNamespace(__version__="9.9"))
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    monkeypatch.delenv(align.NO_SIGNATURE_CACHE_ENV_VAR, raising=False)
+    cache_file = align._align_signature_cache_file(fake_align)
+    assert cache_file.parent == tmp_path / "transcribe-suite"
+    monkeypatch.setenv(align.NO_SIGNATURE_CACHE_ENV_VAR, "1")
+    assert align._align_signature_cache_file(fake_align) is None
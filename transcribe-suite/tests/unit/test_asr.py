@@ -0,0 +1,174 @@
+import json
+import logging
+import os
+from pathlib import Path
+
+from asr import ASRProcessor
+from utils import read_json
+
+
+def _processor(**asr_cfg) -> ASRProcessor:
+    return ASRProcessor({"asr": {"device": "cpu", **asr_cfg}}, logging.getLogger("test_asr"))
+
+
+def test_update_state_batches_flushes(tmp_path):
+    processor = _processor()
+    state_path = tmp_path / "manifest_state.json"
+    state = {"meta": {}, "segments": {}}
+    processor._save_state(state_path, state)
+    processor._update_state(state, 0, "IN_PROGRESS", 0, state_path)
+    processor._update_state(state, 0, "DONE", 0, state_path)
+    assert read_json(state_path)["segments"] == {}
+    processor._maybe_flush_state(state_path, state, force=True)
+    assert read_json(state_path)["segments"]["0"]["status"] == "DONE"
+
+
+def test_read_manifest_resolves_relative_paths(tmp_path):
+    seg_dir = tmp_path / "segments"
+    seg_dir.mkdir()
+    (seg_dir / "seg_0.wav").write_bytes(b"\x00")
+    manifest = tmp_path / "manifest.csv"
+    manifest.write_text("index,start_ms,end_ms,path\n0,0,75000,segments/seg_0.wav\n", encoding="utf-8")
+    jobs = _processor()._read_manifest(manifest, tmp_path, tmp_path / "01_asr_jsonl")
+    assert [(job.index, job.start_ms, job.end_ms) for job in jobs] == [(0, 0, 75000)]
+    assert jobs[0].audio_path == (seg_dir / "seg_0.wav").resolve()
+    assert jobs[0].output_path.name == "seg_00000.jsonl"
+
+
+def test_filter_jobs_marks_existing_outputs_done(tmp_path):
+    seg_dir = tmp_path / "segments"
+    seg_dir.mkdir()
+    rows = ["index,start_ms,end_ms,path"]
+    for idx in range(3):
+        (seg_dir / f"seg_{idx}.wav").write_bytes(b"\x00")
+        rows.append(f"{idx},{idx * 1000},{idx * 1000 + 900},segments/seg_{idx}.wav")
+    manifest = tmp_path / "manifest.csv"
+    manifest.write_text("\n".join(rows) + "\n", encoding="utf-8")
+    jsonl_dir = tmp_path / "01_asr_jsonl"
+    jsonl_dir.mkdir()
+    (jsonl_dir / "seg_00001.jsonl").write_text("{}\n", encoding="utf-8")
+    processor = _processor()
+    state = {"meta": {}, "segments": {}}
+    pending = processor._filter_jobs(processor._read_manifest(manifest, tmp_path, jsonl_dir), state, False, False)
+    assert [job.index for job in pending] == [0, 2]
+    assert state["segments"]["1"]["status"] == "DONE"
+
+
+def test_cpu_slices_are_disjoint(monkeypatch):
+    import asr
+
+    monkeypatch.setattr(asr.os, "sched_getaffinity", lambda pid: set(range(8)), raising=False)
+    monkeypatch.setattr(asr, "_is_primary_thread", lambda cpu: True)
+    processor = _processor()
+    assert processor._cpu_slices(3) == [[0, 1], [2, 3], [4, 5]]
+    assert processor._cpu_slices(1) == []
+    assert _processor(pin_cpus=False)._cpu_slices(3) == []
+
+
+def test_worker_bootstrap_caps_cpu_threads_to_pinned_slice(tmp_path, monkeypatch):
+    import multiprocessing
+
+    import asr
+
+    monkeypatch.setattr(asr.os, "sched_setaffinity", lambda pid, cpus: None, raising=False)
+    monkeypatch.setattr(asr, "_WORKER_MODEL_OPTIONS", {})
+    monkeypatch.setattr(asr, "_WORKER_LOG_PATH", None)
+    monkeypatch.setattr(asr, "_WORKER_LOGGER", None)
+    asr._worker_bootstrap({}, str(tmp_path), {"cpu_threads": 8}, [[0, 1]], multiprocessing.Value("i", 0))
+    assert asr._WORKER_MODEL_OPTIONS["cpu_threads"] == 2
+    asr._worker_bootstrap({}, str(tmp_path), {"cpu_threads": 1}, [[0, 1]], multiprocessing.Value("i", 0))
+    assert asr._WORKER_MODEL_OPTIONS["cpu_threads"] == 1
+    asr._worker_bootstrap({}, str(tmp_path), {}, [[0, 1, 2]], multiprocessing.Value("i", 0))
+    assert asr._WORKER_MODEL_OPTIONS["cpu_threads"] == 3
+
+
+def test_run_collects_results_through_completion_queue(tmp_path, monkeypatch):
+    import asr
+
+    seg_dir = tmp_path / "segments"
+    seg_dir.mkdir()
+    rows = ["index,start_ms,end_ms,path"]
+    for idx in range(4):
+        (seg_dir / f"seg_{idx}.wav").write_bytes(b"\x00")
+        rows.append(f"{idx},{idx * 1000},{idx * 1000 + 900},segments/seg_{idx}.wav")
+    manifest = tmp_path / "manifest.csv"
+    manifest.write_text("\n".join(rows) + "\n", encoding="utf-8")
+
+    def fake_transcribe(job, decoder_cfg, model=None, batched=None, writes=None):
+        asr._worker_log(f"Segment {job['index']:05d}")
+        writes.put((Path(job["output_path"]), b"{}\n"))
+        return {"segment_index": job["index"], "language": "fr", "text_sample": "bonjour"}
+
+    processor = _processor(workers=2)
+    monkeypatch.setattr(asr, "_transcribe_segment", fake_transcribe)
+    monkeypatch.setattr(processor, "_uses_gpu_threads", lambda: True)
+    monkeypatch.setattr(processor, "_shared_gpu_models", lambda: (None, None))
+    try:
+        result = processor.run(manifest, tmp_path, requested_lang="auto")
+    finally:
+        processor.close()
+    assert sorted(item["segment_index"] for item in result["results"]) == [0, 1, 2, 3]
+    assert result["language"] == "fr"
+    state = read_json(tmp_path / "manifest_state.json")
+    assert {entry["status"] for entry in state["segments"].values()} == {"DONE"}
+    assert len(list((tmp_path / "01_asr_jsonl").glob("seg_*.jsonl"))) == 4
+    worker_log = (tmp_path / "logs" / f"asr_worker_{os.getpid()}.log").read_text(encoding="utf-8")
+    assert sorted(worker_log.split("\n")[:4]) == [f"Segment {idx:05d}" for idx in range(4)]
+
+
+def test_gpu_thread_pool_matches_model_pool(monkeypatch):
+    processor = _processor(workers=3)
+    monkeypatch.setattr(processor, "_uses_gpu_threads", lambda: True)
+    monkeypatch.setattr(processor, "_physical_cores", lambda: 2)
+    monkeypatch.setattr(processor, "_gpu_count", lambda: 3)
+    try:
+        executor = processor._get_executor({}, {}, Path("."))
+        # num_workers is per device: 2 CTranslate2 workers on each of the 3 GPUs
+        assert processor._gpu_workers_per_device() == 2
+        assert executor._max_workers == processor._gpu_pool_size() == 6
+    finally:
+        processor.close()
+
+
+def test_process_pool_survives_pending_count_changes(monkeypatch):
+    processor = _processor(workers=4)
+    monkeypatch.setattr(processor, "_physical_cores", lambda: 8)
+    try:
+        executor = processor._get_executor({}, {}, Path("."))
+        assert executor._max_workers == 4
+        # a resume with a single pending segment resolves a plan of 1 but keeps the loaded pool
+        assert processor._resolve_worker_count(1).count == 1
+        assert processor._get_executor({}, {}, Path(".")) is executor
+    finally:
+        processor.close()
+
+
+def test_save_state_replaces_file_atomically(tmp_path):
+    processor = _processor()
+    state_path = tmp_path / "manifest_state.json"
+    processor._save_state(state_path, {"meta": {}, "segments": {"0": {"status": "DONE"}}})
+    assert read_json(state_path)["segments"]["0"]["status"] == "DONE"
+    assert not (tmp_path / "manifest_state.json.tmp").exists()
+
+
+def test_decoder_options_prefilters_transcribe_kwargs():
+    options = _processor(temperature=0.0, temperature_fallback=0.2, chunk_length=None, beam_size="2")._decoder_options(None)
+    kwargs = options["transcribe_kwargs"]
+    assert kwargs["temperature"] == (0.0, 0.2)
+    assert kwargs["beam_size"] == 2
+    assert "chunk_length" not in kwargs
+    assert "language" not in kwargs
+
+
+def test_write_metrics_keeps_sections_written_by_others(tmp_path):
+    processor = _processor()
+    processor._write_metrics(tmp_path, {"status": "ok"})
+    metrics_path = tmp_path / "logs" / "metrics.json"
+    payload = read_json(metrics_path)
+    payload["pipeline"] = {"status": "ok"}
+    metrics_path.write_text(json.dumps(payload), encoding="utf-8")
+    os.utime(metrics_path, ns=(0, 0))
+    processor._write_metrics(tmp_path, {"status": "failed"})
+    payload = read_json(metrics_path)
+    assert payload["pipeline"] == {"status": "ok"}
+    assert payload["asr"]["status"] == "failed"
@@ -1,4 +1,4 @@
-from chunker import Chunker
+from chunker import Chunker, _chunk_windows
 
 
 def test_chunker_builds_chunks_with_overlap():
@@ -35,6 +35,54 @@ def test_chunker_builds_chunks_with_overlap():
     assert "section_ids" in first
 
 
+
+def test_chunker_confidence_stats():
+    chunker = Chunker({"min_sentences": 1, "min_tokens": 1000, "overlap_sentences": 0}, logger=_DummyLogger())
+    sentences = [
+        {"text": f"Phrase {idx}.", "start": float(idx), "end": idx + 1.0, "tokens": tokens, "confidence_mean": conf}
+        for idx, (tokens, conf) in enumerate([(2, 0.9), (6, 0.5), (2, 0.7)])
+    ]
+    chunks = chunker.run({"sections": [{"index": 0, "sentences": sentences}]}, language="fr", document_id="doc")
+    assert len(chunks) == 1
+    assert chunks[0]["confidence_mean"] == round((0.9 * 2 + 0.5 * 6 + 0.7 * 2) / 10, 3)
+    assert chunks[0]["confidence_p05"] == 0.5
+    assert chunks[0]["token_count"] == 10
+
+
+def test_chunker_overlap_windows_flag_carried_sentences():
+    chunker = Chunker(
+        {"min_sentences": 2, "min_tokens": 1, "target_tokens": 4, "overlap_sentences": 1}, logger=_DummyLogger()
+    )
+    sentences = [{"text": f"Phrase {idx}.", "start": float(idx), "end": idx + 1.0, "tokens": 2} for idx in range(5)]
+    chunks = chunker.run({"sections": [{"index": 0, "sentences": sentences}]}, language="fr", document_id="doc")
+    assert [[row["text"] for row in chunk["sentences"]] for chunk in chunks] == [
+        ["Phrase 0.", "Phrase 1."],
+        ["Phrase 1.", "Phrase 2."],
+        ["Phrase 2.", "Phrase 3."],
+        ["Phrase 3.", "Phrase 4."],
+        ["Phrase 4."],
+    ]
+    assert [row["overlap"] for row in chunks[1]["sentences"]] == [True, False]
+    assert chunks[1]["parent_ids_prev"] == [chunks[0]["id"]]
+    assert chunks[0]["parent_ids_prev"] == []
+    assert chunks[1]["token_count"] == 4
+    assert all(set(sentence) == {"text", "start", "end", "tokens"} for sentence in sentences)
+
+
+def test_chunk_windows_bisect_close_points():
+    assert _chunk_windows([5, 5, 5, 5, 5], close_tokens=10, min_sentences=1, overlap=1) == [
+        (0, 2, 0),
+        (1, 3, 1),
+        (2, 4, 1),
+        (3, 5, 1),
+        (4, 5, 1),
+    ]
+    # carried sentences alone already reach the threshold: the next chunk still takes one new sentence
+    assert _chunk_windows([20, 1, 1], close_tokens=10, min_sentences=1, overlap=1) == [(0, 1, 0), (0, 2, 1), (1, 3, 1)]
+    assert _chunk_windows([1, 1, 1], close_tokens=10, min_sentences=2, overlap=0) == [(0, 3, 0)]
+    assert _chunk_windows([], close_tokens=10, min_sentences=2, overlap=1) == []
+
+
 class _DummyLogger:
     def info(self, *_, **__):
         return
@@ -1,3 +1,5 @@
+from collections import deque
+
 from clean import Cleaner
 
 
@@ -21,6 +23,140 @@ def test_cleaner_removes_fillers_and_caps():
     assert "euh" not in cleaned[0]["text_human"].lower()
 
 
+def test_strip_fillers_prefers_longest_shared_prefix():
+    config = {"cleaning": {"remove_fillers": True, "fillers": {"fr": ["euh", "euh bah", "en fait", "heu"]}}}
+    cleaner = Cleaner(config, logger=_DummyLogger())
+    text, hits, tic_hits = cleaner._strip_noise("Euh bah on part, euhh en fait heu non", "fr")
+    assert (hits, tic_hits) == (3, 0)
+    assert text.split() == ["on", "part,", "euhh", "non"]
+
+
+def test_filler_patterns_resolved_once_per_language(monkeypatch):
+    config = {"languages": {"en": {"fillers": ["um"]}}, "cleaning": {"remove_fillers": True, "fillers": {"fr": ["euh"]}}}
+    cleaner = Cleaner(config, logger=_DummyLogger())
+    assert set(cleaner._noise_patterns) == {"fr", "en"}
+    lookups = []
+    monkeypatch.setattr(cleaner, "_get_fillers", lambda language: lookups.append(language) or [])
+    assert cleaner._strip_noise("um hello", "en") == ("  hello", 1, 0)
+    assert cleaner._strip_noise("hallo", "de") == ("hallo", 0, 0)
+    assert cleaner._strip_noise("hallo", "de") == ("hallo", 0, 0)
+    assert lookups == ["de"]
+
+
+def test_blank_fillers_compile_no_pattern():
+    config = {"cleaning": {"remove_fillers": True, "fillers": {"fr": ["", "  "]}}}
+    cleaner = Cleaner(config, logger=_DummyLogger())
+    assert cleaner._noise_patterns["fr"] is None
+    assert cleaner._strip_noise("bonjour", "fr") == ("bonjour", 0, 0)
+
+
+def test_tics_and_fillers_stripped_in_one_pass_with_split_counts():
+    config = {
+        "cleaning": {
+            "remove_fillers": True,
+            "fillers": {"fr": ["euh", "bah"]},
+            "normalization": {"tic_markers": ["du coup", "genre"]},
+        }
+    }
+    cleaner = Cleaner(config, logger=_DummyLogger())
+    text, filler_hits, tic_hits = cleaner._strip_noise("Euh du  coup il part, genre bah demain", "fr")
+    assert (filler_hits, tic_hits) == (2, 2)
+    assert text.split() == ["il", "part,", "demain"]
+    assert cleaner._sanitize_text("« bonjour » , dit -il !", "fr")[0] == "«bonjour», dit -il!"
+
+
+def test_replacements_applied_in_one_pass():
+    config = {"cleaning": {"fix_proper_nouns": [["chat gpt", "ChatGPT"], ["open ai", "OpenAI"]]}}
+    cleaner = Cleaner(config, logger=_DummyLogger())
+    text, hits = cleaner._apply_replacements("Chat GPT et open AI, puis chat gpt", cleaner._replacement_patterns)
+    assert text == "ChatGPT et OpenAI, puis ChatGPT"
+    assert hits == 3
+    assert cleaner._apply_replacements("rien", cleaner._auto_correction_patterns) == ("rien", 0)
+
+
+def test_replacements_prefer_longest_overlapping_pattern():
+    pairs = [["marie", "Marie"], ["marie claire", "Marie-Claire"]]
+    config = {"cleaning": {"fix_proper_nouns": pairs, "auto_corrections": pairs}}
+    cleaner = Cleaner(config, logger=_DummyLogger())
+    for patterns in (cleaner._replacement_patterns, cleaner._auto_correction_patterns):
+        text, hits = cleaner._apply_replacements("marie claire et marie", patterns)
+        assert text == "Marie-Claire et Marie"
+        assert hits == 2
+
+
+def test_redundancy_scores_long_repetitive_text_without_autojunk():
+    cleaner = Cleaner({"cleaning": {"redundancy": {"enabled": True, "similarity": 0.9}}}, logger=_DummyLogger())
+    cleaner._init_report(2)
+    buffer = deque([{"text": "on va on va voir " * 15, "start": 0.0, "end": 10.0}])
+    assert cleaner._is_redundant("on va voir on va " * 15 + " ok", buffer, 11.0, 20.0)
+    assert not cleaner._is_redundant("une phrase complètement différente ici", buffer, 11.0, 20.0)
+    assert "matcher" in buffer[0]
+
+
+def test_dedupe_words_collapses_runs_until_stable():
+    cleaner = Cleaner({}, logger=_DummyLogger())
+    assert cleaner._dedupe_words("Le le le chat, nous nous partons") == "Le chat, nous partons"
+    assert cleaner._dedupe_words("a a-a a") == "a-a"
+    assert cleaner._dedupe_words("") == ""
+
+
+def test_scan_words_filters_flags_and_scores_in_one_pass():
+    config = {"cleaning": {"min_word_confidence": 0.3, "confidence": {"word_threshold": 0.5}}}
+    cleaner = Cleaner(config, logger=_DummyLogger())
+    words = [
+        {"word": " a ", "probability": 0.9},
+        {"word": "b", "probability": 0.4},
+        {"word": "c", "probability": 0.1},
+        {"word": "d", "probability": None},
+        {"word": "e"},
+    ]
+    kept, flagged, scores = cleaner._scan_words(words)
+    assert [word["word"] for word in kept] == [" a ", "b", "d", "e"]
+    assert [item["word"] for item in flagged] == ["b", "c"]
+    assert scores == [0.9, 0.4]
+    assert kept[0] is words[0]
+
+
+def test_parallel_run_matches_sequential():
+    config = {
+        "languages": {"fr": {"fillers": ["euh"]}},
+        "cleaning": {
+            "remove_fillers": True,
+            "fix_proper_nouns": [["chat gpt", "ChatGPT"]],
+            "min_word_confidence": 0.2,
+            "redundancy": {"enabled": True, "similarity": 0.9},
+        },
+    }
+    segments = [
+        {
+            "start": float(idx),
+            "end": idx + 0.9,
+            "text": f"euh segment {idx % 7} avec chat gpt et  l' exemple {idx % 3}",
+            "words": [{"word": "segment", "probability": (idx % 10) / 10}],
+        }
+        for idx in range(40)
+    ]
+    sequential = Cleaner(config, logger=_DummyLogger()).run(segments, language="fr")
+    parallel_cfg = {**config, "cleaning": {**config["cleaning"], "workers": 2, "parallel_min_segments": 1}}
+    parallel_cleaner = Cleaner(parallel_cfg, logger=_DummyLogger())
+    assert parallel_cleaner.run(segments, language="fr") == sequential
+    assert parallel_cleaner.report()["fillers_removed"] == 40
+
+
+def test_parallel_run_falls_back_when_payload_is_not_picklable():
+    config = {"cleaning": {"workers": 2, "parallel_min_segments": 1}}
+    segments = [
+        {"start": float(idx), "end": idx + 0.9, "text": f"segment {idx}", "words": [], "hook": lambda: None}
+        for idx in range(4)
+    ]
+    warnings = []
+    logger = _DummyLogger()
+    logger.warning = lambda message, *args: warnings.append(message % args)
+    cleaned = Cleaner(config, logger=logger).run(segments, language="fr")
+    assert " ".join(seg["text"] for seg in cleaned) == "segment 0 segment 1 segment 2 segment 3"
+    assert any("repli séquentiel" in message for message in warnings)
+
+
 def test_merge_short_segments_same_speaker():
     config = {
         "cleaning": {
@@ -39,6 +175,24 @@ def test_merge_short_segments_same_speaker():
     assert "premier segment court" in cleaned[0]["text_human"]
 
 
+def test_merge_short_segments_chains_until_speaker_changes():
+    config = {"cleaning": {"merge_short_segments": {"enabled": True, "max_duration": 0.8, "max_gap": 0.3}}}
+    cleaner = Cleaner(config, logger=_DummyLogger())
+    cleaner._init_report(4)
+    segments = [
+        {"start": 0.0, "end": 1.0, "text": "un", "text_fragments": ["un"], "speaker": "S0", "words": []},
+        {"start": 1.1, "end": 1.5, "text": "deux", "text_fragments": ["deux"], "speaker": "S0", "words": []},
+        {"start": 1.6, "end": 2.0, "text": "trois", "text_fragments": ["trois"], "speaker": "S0", "words": []},
+        {"start": 2.1, "end": 2.5, "text": "quatre", "text_fragments": ["quatre"], "speaker": "S1", "words": []},
+    ]
+    merged = cleaner._merge_short_segments(segments)
+    assert [(seg["start"], seg["end"], seg["text"]) for seg in merged] == [
+        (0.0, 2.0, "un deux trois"),
+        (2.1, 2.5, "quatre"),
+    ]
+    assert cleaner.report()["short_merges"] == 2
+
+
 def test_cleaner_normalizes_numbers_and_redundancy():
     config = {
         "numbers": {"human_numbers": True},
@@ -98,5 +252,8 @@ def test_cleaner_redundancy_guard_keeps_distant_segments():
 
 
 class _DummyLogger:
+    def info(self, *_, **__):
+        return
+
     def warning(self, *_, **__):
         return
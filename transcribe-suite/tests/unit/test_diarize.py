@@ -26,6 +26,21 @@ def test_min_turn_blocks_short_speaker_switch():
     assert merged[0]["end"] == 4.0
 
 
+def test_limit_speakers_folds_extra_speakers_into_last_label():
+    diarizer = Diarizer({"diarization": {}}, logger=_DummyLogger())
+    segments = [{"speaker": speaker} for speaker in ["A", "B", "C", "A", None, "C", "B"]]
+    limited = diarizer._limit_speakers(segments, max_speakers=2)
+    assert [seg["speaker"] for seg in limited] == [
+        "SPEAKER_00",
+        "SPEAKER_01",
+        "SPEAKER_01",
+        "SPEAKER_00",
+        "SPEAKER_01",
+        "SPEAKER_01",
+        "SPEAKER_01",
+    ]
+
+
 class _DummyLogger:
     def info(self, *_, **__):
         return
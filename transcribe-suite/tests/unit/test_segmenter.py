@@ -0,0 +1,22 @@
+import logging
+
+from segmenter import Segmenter
+
+
+def _run(tmp_path, monkeypatch, duration):
+    segmenter = Segmenter({"segmenter": {"segment_length": 75.0, "overlap": 8.0}}, logging.getLogger("test_segmenter"))
+    monkeypatch.setattr(segmenter, "_probe_duration", lambda path: duration)
+    monkeypatch.setattr(segmenter, "_slice_audio", lambda *args: None)
+    audio = tmp_path / "audio.wav"
+    audio.write_bytes(b"\x00")
+    segmenter.run(audio, tmp_path / "work")
+    lines = (tmp_path / "work" / "manifest.csv").read_text(encoding="utf-8").splitlines()[1:]
+    return [tuple(int(value) for value in line.split(",")[1:3]) for line in lines]
+
+
+def test_segmenter_absorbs_short_tail(tmp_path, monkeypatch):
+    assert _run(tmp_path, monkeypatch, 145.0) == [(0, 75000), (67000, 145000)]
+
+
+def test_segmenter_stops_at_end_of_audio(tmp_path, monkeypatch):
+    assert _run(tmp_path, monkeypatch, 200.0) == [(0, 75000), (67000, 142000), (134000, 200000)]
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import hashlib
+import json
 import os
 from pathlib import Path
 
@@ -37,3 +39,16 @@ def test_exports_can_be_local_with_flag(monkeypatch, tmp_path):
     repo_root = utils.TS_ROOT
     result = utils.prepare_paths(repo_root, cfg, allow_local_exports=True)
     assert "exports_dir" in result
+
+
+def test_stable_id_matches_sorted_json_digest():
+    for args in [("doc", 1.23456, 7.0, "SPEAKER_00"), ("é\"x", 0, None, None), ("doc", float("nan"), 1.0, "S")]:
+        source, start, end, speaker = args
+        payload = {
+            "src": source,
+            "t0": round(float(start or 0.0), 3),
+            "t1": round(float(end or start or 0.0), 3),
+            "spk": speaker or "",
+        }
+        expected = hashlib.sha1(json.dumps(payload, sort_keys=True, separators=(",", ":")).encode("utf-8")).hexdigest()[:12]
+        assert utils.stable_id(*args) == expected